@@ -1,7 +1,7 @@
 from collections import OrderedDict
 from typing import List, Optional
 
-from amads.core.basics import Score
+from amads.core.basics import Note, Part, Score
 
 
 class MelodyTokenizer:
@@ -71,31 +71,62 @@ class FantasticTokenizer(MelodyTokenizer):
         Raises
         ------
         ValueError
-            if score has more than one part, if the part has concurrent
-            notes (IOI == 0) or if a Note in the part has a tie.
+            if score has more than one part or if the part has concurrent
+            notes (IOI == 0).
 
         Returns
         -------
         list
             List of M-Type tokens
         """
-        # Extract notes and calculate IOIs using get_notes
-        notes = score.calc_differences(["ioi-ratio", "interval"])
-        if len(notes) != 1:
+        parts = list(score.find_all(Part))
+        if len(parts) != 1:
             raise ValueError("score has more than one Part")
-        notes = notes[0]
+        return self.tokenize_notes(parts[0].get_sorted_notes())
+
+    def tokenize_notes(self, notes: List[Note]) -> List:
+        """Tokenize a sequence of notes into M-Types.
+
+        This is `tokenize` for notes that are already extracted from a
+        score, such as the phrases of `fantastic_segmenter_notes`, without
+        building a Score for them. The notes are not modified.
+
+        Parameters
+        ----------
+        notes : List[Note]
+            Notes of a melody, sorted by onset time
+
+        Raises
+        ------
+        ValueError
+            if there are concurrent notes (IOI == 0).
+
+        Returns
+        -------
+        list
+            List of M-Type tokens
+        """
         tokens = []
 
         # Skip if phrase is too short
         if len(notes) < 2:
             return tokens
 
-        for note in notes[1:]:
-            pitch_interval = note.get("interval")
+        prev_ioi: Optional[float] = None
+        for prev_note, note in zip(notes, notes[1:]):
+            ioi = note.onset - prev_note.onset
+            if ioi <= 0:
+                raise ValueError(
+                    "notes are not monophonic; cannot compute IOIs"
+                )
+            # the IOI ratio of the first M-Type is undefined (None)
+            ioi_ratio = None if prev_ioi is None else ioi / prev_ioi
+            prev_ioi = ioi
+
             pitch_interval_class: Optional[str] = self.classify_pitch_interval(
-                pitch_interval
+                note.midi_num - prev_note.midi_num
             )
-            ioi_ratio_class = self.classify_ioi_ratio(note.get("ioi_ratio"))
+            ioi_ratio_class = self.classify_ioi_ratio(ioi_ratio)
             token = MType(pitch_interval_class, ioi_ratio_class)
             tokens.append(token)
         return tokens
@@ -1,5 +1,6 @@
+import math
 from collections import Counter
-from typing import Dict, Optional, Union
+from typing import Dict, Iterable, Optional, Union
 
 import numpy as np
 
@@ -15,14 +16,15 @@ class NGramCounter:
         self.ngram_counts = {}
 
     def count_ngrams(
-        self, tokens: list, n: Union[int, list, None] = None
+        self, tokens: Iterable, n: Union[int, list, None] = None
     ) -> None:
         """Update n-gram counts from a sequence of tokens.
 
         Parameters
         ----------
-        tokens : list
-            List of tokens to process
+        tokens : Iterable
+            Tokens to process, e.g. a list, or a generator, which is consumed
+            once without being copied into a list of tokens
         n : int | list | None
             If int, count n-grams of that specific length.
             If list, count n-grams of the specified lengths.
@@ -37,17 +39,28 @@ class NGramCounter:
         >>> ngc.ngram_counts
         {('3', '3', '2'): 10, ('3', '2', '3'): 9, ('2', '3', '3'): 9}
 
+        Tokens can come from any iterable, such as a generator:
+
+        >>> ngc.reset()
+        >>> ngc.count_ngrams(tokens=(beat for beat in tresillo), n=2)
+        >>> ngc.ngram_counts
+        {('3', '3'): 1, ('3', '2'): 1}
+
         """
+        # Convert each token to a string once; every n-gram containing it
+        # reuses the string
+        strings = [str(token) for token in tokens]
+
         # Determine n-gram lengths to count
         if n is None:
-            n_values = range(1, len(tokens) + 1)
+            n_values = range(1, len(strings) + 1)
         elif isinstance(n, int):
             if n < 1:
                 raise ValueError(f"n-gram length {n} is less than 1")
-            if n > len(tokens):
+            if n > len(strings):
                 raise ValueError(
                     f"n-gram length {n} is larger than token sequence "
-                    f"length {len(tokens)}"
+                    f"length {len(strings)}"
                 )
             n_values = [n]
         else:
@@ -59,20 +72,21 @@ class NGramCounter:
                     )
                 if val < 1:
                     raise ValueError(f"n-gram length {val} is less than 1")
-                if val > len(tokens):
+                if val > len(strings):
                     raise ValueError(
                         f"n-gram length {val} is larger than token sequence "
-                        f"length {len(tokens)}"
+                        f"length {len(strings)}"
                     )
             n_values = n
 
         # Count n-grams and update the counter
+        counts = self.ngram_counts
         for n in n_values:
-            for i in range(len(tokens) - n + 1):
+            for i in range(len(strings) - n + 1):
                 # Create hashable n-gram
-                ngram = tuple(str(token) for token in tokens[i : i + n])
+                ngram = tuple(strings[i : i + n])
                 # Update count in the dictionary
-                self.ngram_counts[ngram] = self.ngram_counts.get(ngram, 0) + 1
+                counts[ngram] = counts.get(ngram, 0) + 1
 
     def reset(self) -> None:
         """Reset the n-gram counter to empty."""
@@ -330,7 +344,7 @@ class NGramCounter:
             return float("nan")
 
         # Calculate H value
-        h = 100.0 * (np.log(n) / (1.01 - (float(hapax_count) / total_types)))
+        h = 100.0 * (math.log(n) / (1.01 - (float(hapax_count) / total_types)))
 
         return float(h)
 
@@ -379,16 +393,20 @@ class NGramCounter:
                 "Cannot calculate entropy for sequence of length <= 1"
             )
 
-        # Calculate probabilities
-        probabilities = [
-            count / total_tokens for count in self.ngram_counts.values()
-        ]
+        # Calculate probabilities, straight from the counts into an array
+        counts = np.fromiter(
+            self.ngram_counts.values(),
+            dtype=np.float64,
+            count=len(self.ngram_counts),
+        )
+        probabilities = counts / total_tokens
 
         # Calculate entropy
         entropy = -np.sum(probabilities * np.log2(probabilities))
 
         # Normalize entropy by maximum possible entropy for sequence length
-        entropy_norm = entropy / np.log2(total_tokens)
+        # (a scalar, so math.log2 rather than the np.log2 ufunc)
+        entropy_norm = entropy / math.log2(total_tokens)
 
         return float(entropy_norm)
 
@@ -8,6 +8,7 @@ Author
 Peter Harrison
 """
 
+from operator import attrgetter
 from typing import Iterable, Iterator, List, Optional, Union, cast
 
 from amads.algorithms.slice.slice import Slice
@@ -194,7 +195,7 @@ def sliding_window(
         notes = passage
 
     notes = cast(List[Note], list(notes))
-    notes.sort(key=lambda n: (n.onset, n.pitch))
+    notes.sort(key=attrgetter("onset", "pitch"))
 
     # We could rely on Window to obey `align`, but here we convert onset and
     # offset to always use "left". By using left, we can guarantee when
@@ -51,6 +51,7 @@ onsets are optional and default to None. To make this simple example work:
 
 import copy
 from math import isclose
+from operator import attrgetter
 from typing import (
     Any,
     Dict,
@@ -63,6 +64,8 @@ from typing import (
     cast,
 )
 
+import numpy as np
+
 from amads.core.pitch import Pitch
 from amads.core.timemap import TimeMap
 
@@ -1657,16 +1660,19 @@ class EventGroup(Event):
         bool
             True if the list of notes is monophonic, False otherwise.
         """
-        prev = None
-        notes = self.get_sorted_notes()
-        # Check for overlaps
-        for note in notes:
-            if prev:
-                # 0.01 is to prevent precision errors when comparing floats
-                if note.onset - prev.offset < -0.01:
-                    return False
-            prev = note
-        return True
+        notes : List[Note] = cast(List[Note], self.list_all(Note))
+        onsets = np.fromiter((note.onset for note in notes),
+                             dtype=np.float64, count=len(notes))
+        offsets = np.fromiter((note.offset for note in notes),
+                              dtype=np.float64, count=len(notes))
+        # Notes are usually in onset order already; sort only if they are not
+        if np.any(onsets[1:] < onsets[:-1]):
+            order = np.argsort(onsets, kind="stable")
+            onsets = onsets[order]
+            offsets = offsets[order]
+        # Check for overlaps of each note with the previous one
+        # 0.01 is to prevent precision errors when comparing floats
+        return not np.any(onsets[1:] - offsets[:-1] < -0.01)
 
 
     def time_shift(self, increment: float,
@@ -1848,7 +1854,8 @@ class EventGroup(Event):
 
     def find_all(self, elem_type: Type[Event],
                  include_tied_to_notes: bool = False,
-                 ignore: list[Note] = []) -> Generator[Event, None, None]:
+                 ignore: Optional[set[Note]] = None
+                 ) -> Generator[Event, None, None]:
         """Find all instances of a specific type within the EventGroup.
 
         Assumes that objects of type `elem_type` are not nested within
@@ -1874,7 +1881,7 @@ class EventGroup(Event):
             the `duration` property returns the total tied group duration in the
             case that a Note is tied.
 
-        ignore : list[Note]
+        ignore : Optional[set[Note]]
             Do not use this parameter. It is for the implementation to keep
             track of forward references from tied notes.
 
@@ -1888,7 +1895,11 @@ class EventGroup(Event):
         # returned since it is found first, and the content is not
         # searched. This makes it efficient, e.g., to search for
         # Parts in a Score without enumerating all Notes within.
-        
+        # Each search has its own set of tied-to notes to skip, so that
+        # a search that is not run to the end (e.g., by has_ties) leaves
+        # nothing behind to slow down later searches.
+        if ignore is None:
+            ignore = set()
         for elem in self.content:
             if isinstance(elem, elem_type):
                 if elem_type == Note:
@@ -1896,7 +1907,7 @@ class EventGroup(Event):
                         yield elem
                     else:  # ignore tied-to notes
                         if elem.tie:
-                            ignore.append(elem.tie)
+                            ignore.add(elem.tie)
                         if elem in ignore:
                             ignore.remove(elem)  # type: ignore (elem is Note)
                         else:
@@ -1928,7 +1939,7 @@ class EventGroup(Event):
             a list of sorted notes with merged ties
         """
         notes : List[Note] = cast(List[Note], self.list_all(Note))
-        notes.sort(key=lambda x: (x.onset, x.pitch))
+        notes.sort(key=attrgetter("onset", "pitch"))
         return notes
 
 
@@ -2138,7 +2149,7 @@ class EventGroup(Event):
 
 
     def merge_tied_notes(self, parent: Optional["EventGroup"] = None,
-                         ignore: list[Note] = []) -> "EventGroup":
+                         ignore: Optional[set[Note]] = None) -> "EventGroup":
         """Create a new `EventGroup` with tied notes replaced by single notes.
 
         If ties cross staffs, the replacement is placed in the staff of the
@@ -2155,7 +2166,7 @@ class EventGroup(Event):
         parent: Optional(EventGroup)
             Where to insert the result.
 
-        ignore: Optional(list[Note])
+        ignore: Optional[set[Note]]
             This parameter is used internally. Caller should not use
             this parameter.
 
@@ -2167,25 +2178,25 @@ class EventGroup(Event):
         # Algorithm: Find all notes, removing tied notes and updating
         # duration when ties are found. These tied notes are added to
         # ignore so they can be skipped when they are encountered.
+        # A fresh set per top-level call: a shared default would keep any
+        # tied notes left over from a previous call.
+        if ignore is None:
+            ignore = set()
 
         group = self.insert_emptycopy_into(parent)
         for event in self.content:
             if isinstance(event, Note):
                 if event in ignore:  # do not copy tied notes into group;
                     if event.tie:
-                        ignore.append(event.tie)  # add tied note to ignore
+                        ignore.add(event.tie)  # add tied note to ignore
                     # We will not see this note again, so
-                    # we can also remove it from ignore. Removal is expensive
-                    # but it could be worse for ignore to grow large when there
-                    # are many ties since we have to search it entirely once
-                    # per note. An alternate representation might be a set to
-                    # make searching fast.
+                    # we can also remove it from ignore.
                     ignore.remove(event)
                 else:
                     if event.tie:
                         tied_note = event.tie  # save the tied-to note
                         event.tie = None  # block the copy
-                        ignore.append(tied_note)
+                        ignore.add(tied_note)
                         # copy note into group:
                         event_copy = event.insert_copy_into(group)
                         event.tie = tied_note  # restore original event
@@ -3460,7 +3471,7 @@ class Score(Concurrence):
         # notes can be modified, so reuse them in the new_part:
         for note in notes:
             note.parent = new_part
-        notes.sort(key=lambda x: (x.onset, x.pitch))
+        notes.sort(key=attrgetter("onset", "pitch"))
         new_part.content = notes
         # remove all the parts that we merged, leaving only new_part
         score.content = [new_part]
@@ -3538,7 +3549,7 @@ class Score(Concurrence):
                         note.set("rolled", True)
                 note.parent = new_part
             # notes with equal onset times are sorted in pitch from high to low
-            notes.sort(key=lambda x: (x.onset, x.pitch))
+            notes.sort(key=attrgetter("onset", "pitch"))
 
             new_part.content = notes  # type: ignore (List[Note] < List[Event])
 
@@ -4148,7 +4159,7 @@ class Part(EventGroup):
                 if rolled:
                     note.set("rolled", True)
             note.parent = part
-        notes.sort(key=lambda x: (x.onset, x.pitch))
+        notes.sort(key=attrgetter("onset", "pitch"))
         part.content = notes  # type: ignore (List[Note] < List[Event])
         return part
 
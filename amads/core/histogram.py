@@ -42,6 +42,7 @@ __author__ = "Roger Dannenberg"
 
 
 import math
+from bisect import bisect_right
 from typing import Optional, cast
 
 
@@ -224,11 +225,8 @@ class Histogram1D:
         the next boundary above value. If the value is greater or
         equal to the highest boundary, len(bin_boundaries) is returned.
         """
-        i = 0  # for the strange case of len(bin_boundaries) == 0
-        for i in range(len(self.bin_boundaries)):
-            if self.bin_boundaries[i] > value:
-                return i
-        return len(self.bin_boundaries)
+        # boundaries are sorted, so this is a binary search
+        return bisect_right(self.bin_boundaries, value)
 
     def add_point(self, data: float, weight: float = 1.0):
         """Record one count or weight update to the histogram
@@ -361,18 +359,20 @@ class Histogram2D(Histogram1D):
         """
         i = None  # index for data1
         if data1 is not None:
-            if prev:
+            if prev is not None:
                 i = prev
             else:
                 i = self.find_bin(data1)
-                if i == 0 or i == len(self.bins):
-                    if self.ignore_extrema:
+                if self.ignore_extrema:
+                    if i == 0 or i == len(self.bin_boundaries):
                         return None  # out of bounds
+                    i -= 1  # bin[0] corresponds to bounds[1:2]
 
         j = self.find_bin(data2)  # index for data2
-        if j == 0 or j == len(self.bins) + 1:
-            if self.ignore_extrema:
-                return None
+        if self.ignore_extrema:
+            if j == 0 or j == len(self.bin_boundaries):
+                return None  # out of bounds
+            j -= 1
 
         if i is not None:
             self.bins[i][j] += weight
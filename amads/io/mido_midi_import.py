@@ -16,7 +16,7 @@ import warnings
 from collections import defaultdict
 from math import isclose
 from pathlib import Path
-from typing import cast
+from typing import BinaryIO, Optional, cast
 
 import mido
 
@@ -486,6 +486,7 @@ def mido_midi_import(
     show: bool = False,
     group_by_instrument: bool = True,
     ignore_hidden=False,
+    data: Optional[BinaryIO] = None,
 ) -> Score:
     """Import a MIDI file and return an AMADS ``Score`` using the MIDO library.
 
@@ -512,6 +513,10 @@ def mido_midi_import(
         as multiple Staffs under one Part.
     ignore_hidden: bool
         Unused in MIDI import. See read_score() for details.
+    data: Optional[BinaryIO]
+        If given, the MIDI data is read from this binary stream and
+        `filename` is only used for messages. (read_score() uses this
+        to hand over the memory-mapped file.)
 
 
     Returns
@@ -533,7 +538,10 @@ def mido_midi_import(
     """
     flatten = flatten or collapse
 
-    mid = mido.MidiFile(str(filename))
+    if data is not None:
+        mid = mido.MidiFile(file=data)
+    else:
+        mid = mido.MidiFile(str(filename))
     if show:
         _mido_show(mid, filename)
 
@@ -25,7 +25,7 @@ __author__ = "Roger B. Dannenberg"
 import warnings
 from math import isclose
 from pathlib import Path
-from typing import cast
+from typing import BinaryIO, Optional, cast
 
 from pretty_midi import PrettyMIDI, program_to_instrument_name
 
@@ -214,6 +214,7 @@ def pretty_midi_import(
     show: bool = False,
     group_by_instrument: bool = True,
     ignore_hidden=False,
+    data: Optional[BinaryIO] = None,
 ) -> Score:
     """
     Use PrettyMIDI to import a MIDI file and convert it to a Score.
@@ -240,6 +241,10 @@ def pretty_midi_import(
         See read_midi() for more details.
     ignore_hidden: bool
         Unused in MIDI import. See read_score() for details.
+    data: Optional[BinaryIO]
+        If given, the MIDI data is read from this binary stream and
+        `filename` is only used for messages. (read_score() uses this
+        to hand over the memory-mapped file.)
 
     Returns
     -------
@@ -258,7 +263,7 @@ def pretty_midi_import(
 
     # Load the MIDI file using PrettyMIDI
     filename = str(filename)
-    pmscore = PrettyMIDI(filename)
+    pmscore = PrettyMIDI(data if data is not None else filename)
     if show:
         from amads.io.pm_show import pretty_midi_show
 
@@ -1,16 +1,21 @@
 """Functions for music data input."""
 
+from __future__ import annotations
+
 __author__ = "Roger B. Dannenberg"
 
+import mmap
 import tempfile
 import urllib.request
 import warnings
 from math import isclose
 from pathlib import Path
-from typing import Callable, List, Optional, cast
+from typing import TYPE_CHECKING, Callable, List, Optional, cast
+
+from amads.io.writescore import _suffix, _suffix_to_format, _warning_filter
 
-from amads.core.basics import Event, Measure, Part, Rest, Score, Staff
-from amads.io.writescore import _suffix_to_format
+if TYPE_CHECKING:  # amads.core.basics is only needed once a file is read
+    from amads.core.basics import Event, Score
 
 # This module, readscore, is regarded as a singleton class with
 # the following attributes:
@@ -41,6 +46,13 @@ allowed_subsystems = {
     "mei": ["music21", "partitura"],
 }
 
+# frozen copies of the names accepted by the set_* functions
+_allowed_readers = {
+    format: frozenset(readers) for format, readers in allowed_subsystems.items()
+}
+_warning_levels = frozenset({"none", "low", "default", "high"})
+_write_only_extensions = frozenset({".pdf", ".ly"})
+
 # mapping from preference strings to subsystem callables
 _subsystem_map = {
     "music21": ("amads.io.m21_import", "music21_import"),
@@ -49,6 +61,11 @@ _subsystem_map = {
     "partitura": ("amads.io.pt_import", "partitura_import"),
 }
 
+# subsystems whose import functions accept a binary stream via the `data`
+# keyword. For these, the file is memory-mapped once and handed over as
+# bytes so that the subsystem does not re-open and re-read the file.
+_stream_subsystems = {"pretty_midi", "mido"}
+
 
 def set_preferred_midi_reader(reader: str = _default_midi_reader) -> str:
     """
@@ -74,9 +91,10 @@ def set_preferred_midi_reader(reader: str = _default_midi_reader) -> str:
         If an invalid reader is provided.
     """
     global preferred_midi_reader
-    allowed = ["music21", "pretty_midi", "mido"]
-    if reader not in allowed_subsystems["midi"]:
-        raise ValueError(f"Invalid MIDI reader. Must be one of {allowed}")
+    if reader not in _allowed_readers["midi"]:
+        raise ValueError(
+            f"Invalid MIDI reader. Must be one of {allowed_subsystems['midi']}"
+        )
 
     previous = preferred_midi_reader
     preferred_midi_reader = reader
@@ -107,8 +125,8 @@ def set_preferred_xml_reader(reader: str = _default_xml_reader) -> str:
         If an invalid reader is provided.
     """
     global preferred_xml_reader
-    allowed = allowed_subsystems["musicxml"]
-    if reader not in allowed:
+    if reader not in _allowed_readers["musicxml"]:
+        allowed = allowed_subsystems["musicxml"]
         raise ValueError(f"Invalid XML reader. Must be one of {allowed}")
 
     previous = preferred_xml_reader
@@ -140,8 +158,8 @@ def set_preferred_kern_reader(reader: str = _default_kern_reader) -> str:
         If an invalid reader is provided.
     """
     global preferred_kern_reader
-    allowed = allowed_subsystems["kern"]
-    if reader not in allowed:
+    if reader not in _allowed_readers["kern"]:
+        allowed = allowed_subsystems["kern"]
         raise ValueError(f"Invalid Kern reader. Must be one of {allowed}")
 
     previous = preferred_kern_reader
@@ -173,8 +191,8 @@ def set_preferred_mei_reader(reader: str = _default_mei_reader) -> str:
         If an invalid reader is provided.
     """
     global preferred_mei_reader
-    allowed = allowed_subsystems["mei"]
-    if reader not in allowed:
+    if reader not in _allowed_readers["mei"]:
+        allowed = allowed_subsystems["mei"]
         raise ValueError(f"Invalid MEI reader. Must be one of {allowed}")
 
     previous = preferred_mei_reader
@@ -220,9 +238,11 @@ def set_reader_warning_level(level: str) -> str:
         If an invalid warning level is provided.
     """
     global reader_warning_level
-    allowed = ["none", "low", "default", "high"]
-    if level not in allowed:
-        raise ValueError(f"Invalid warning level. Must be one of {allowed}")
+    if level not in _warning_levels:
+        raise ValueError(
+            "Invalid warning level. Must be one of "
+            "['none', 'low', 'default', 'high']"
+        )
 
     previous = reader_warning_level
     reader_warning_level = level
@@ -270,7 +290,7 @@ def _check_for_subsystem(
     try:
         if (
             preferred_reader not in _subsystem_map
-            or preferred_reader not in allowed_subsystems[format]
+            or preferred_reader not in _allowed_readers[format]
         ):
             raise ValueError(
                 f"Preferred reader '{preferred_reader}' not supported for "
@@ -285,6 +305,67 @@ def _check_for_subsystem(
     return None, preferred_reader
 
 
+def _sniff_format(filename: str | Path) -> Optional[str]:
+    """Guess the format of a score file from its first bytes.
+
+    Used by `read_score` when the filename extension does not identify
+    the format (e.g. ".dat", ".bin", or no extension at all).
+
+    Parameters
+    ----------
+    filename : str | Path
+        The path to the file.
+
+    Returns
+    -------
+    Optional[str]
+        'midi', 'musicxml', 'mei' or 'kern', or None if the format is
+        not recognized or the file cannot be read.
+    """
+    try:
+        with open(filename, "rb") as f:
+            head = f.read(1024)
+    except OSError:
+        return None
+    if head.startswith(b"MThd"):  # Standard MIDI File header chunk
+        return "midi"
+    if head.startswith(b"PK\x03\x04"):  # zip archive, i.e. compressed .mxl
+        return "musicxml"
+    if head.startswith((b"**", b"!!")):  # Humdrum interpretation or comment
+        return "kern"
+    if head.lstrip(b"\xef\xbb\xbf \t\r\n").startswith(b"<"):
+        return "mei" if b"<mei" in head else "musicxml"
+    return None
+
+
+def _open_readable(
+    filename: str | Path,
+) -> tuple[mmap.mmap, Callable[[], None]]:
+    """Map a file read-only into memory.
+
+    Parameters
+    ----------
+    filename : str | Path
+        The path to the file.
+
+    Returns
+    -------
+    tuple[mmap.mmap, Callable[[], None]]
+        The mapping and a function that releases it.
+
+    Raises
+    ------
+    OSError
+        If the file cannot be opened.
+    ValueError
+        If the file is empty (empty files cannot be mapped).
+    """
+    with open(filename, "rb") as f:
+        # the mapping holds its own file descriptor, so f can be closed
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    return mm, mm.close
+
+
 def _import_score(
     filename: str | Path,
     format: str,
@@ -307,6 +388,25 @@ def _import_score(
                 f"Reading {str(filename)} using {format} reader "
                 f"file={import_fn.__name__}."
             )
+        if preferred_reader in _stream_subsystems:
+            try:
+                mm, close_fn = _open_readable(filename)
+            except (OSError, ValueError):
+                pass  # let the subsystem open (and report on) the file
+            else:
+                try:
+                    return import_fn(  # type: ignore[call-arg]
+                        str(filename),
+                        format,
+                        flatten,
+                        collapse,
+                        show,
+                        group_by_instrument,
+                        ignore_hidden,
+                        data=mm,  # read in place, without a copy
+                    )
+                finally:
+                    close_fn()
         return import_fn(
             str(filename),
             format,
@@ -342,7 +442,9 @@ def read_score(
     If format is None (default), the format is based on the filename
     extension, which can be 'musicxml', 'mid', 'midi', 'smf', 'kern',
     or 'mei'. (Valid extensions are in
-    `amads.io.readscore.valid_score_extensions`.)
+    `amads.io.readscore.valid_score_extensions`.) If the extension is
+    not recognized, the format is guessed from the beginning of the
+    file content.
 
     <small>**Author**: Roger B. Dannenberg</small>
 
@@ -515,28 +617,34 @@ def read_score(
         filename.startswith("http") or "://" in filename
     ):
         with tempfile.NamedTemporaryFile(
-            suffix=Path(filename).suffix or ".tmp", delete=False
+            suffix=_suffix(filename) or ".tmp", delete=False
         ) as tmp_file:
             urllib.request.urlretrieve(filename, tmp_file.name)
             filename = tmp_file.name
 
     if format is None:
-        filename = Path(filename)
-        ext = filename.suffix.lower()
-        if ext not in [".pdf", ".ly"]:  # these are write-only extensions
+        ext = _suffix(filename)
+        if ext not in _write_only_extensions:
             format = _suffix_to_format.get(ext)
+            if not format:  # unknown extension, so look at the content
+                format = _sniff_format(filename)
         if not format:
             raise ValueError(
                 f"Unsupported file extension: {ext}. "
                 f"Valid extensions: {valid_score_extensions}"
             )
 
-    # File format handling
-    with warnings.catch_warnings(record=True) as w:
-        warnings.simplefilter(
-            "ignore" if reader_warning_level == "none" else "always"
-        )
+    # File format handling. Warnings are counted (and printed unless the
+    # level is "low") as they are issued rather than recorded in a list.
+    num_warnings = 0
 
+    def _show_warning(message, category, path, lineno, file=None, line=None):
+        nonlocal num_warnings
+        num_warnings += 1
+        if reader_warning_level != "low":
+            print(f"{path}:{lineno}: {category.__name__}: {message}")
+
+    with _warning_filter(reader_warning_level, _show_warning):
         score = _import_score(
             filename,
             format,
@@ -547,23 +655,15 @@ def read_score(
             ignore_hidden,
         )
 
-        # Warning handling
-        if reader_warning_level == "low":
-            if len(w) > 0:
-                print(
-                    f"Warning: {len(w)} warnings were generated in "
-                    f"read_score({filename}).\n"
-                    "  Use amads.io.readscore.set_reader_warning_level() "
-                    "for more details."
-                )
-        else:  # "none", "default", or "high", but w is empty if "none"
-            for warning in w:
-                print(
-                    f"{warning.filename}:{warning.lineno}: "
-                    f"{warning.category.__name__}: {warning.message}"
-                )
-
-        return score
+    # Warning handling ("none" never gets here with num_warnings > 0)
+    if reader_warning_level == "low" and num_warnings > 0:
+        print(
+            f"Warning: {num_warnings} warnings were generated in "
+            f"read_score({filename}).\n"
+            "  Use amads.io.readscore.set_reader_warning_level() "
+            "for more details."
+        )
+    return score
 
 
 def last_used_reader() -> Optional[str]:
@@ -634,6 +734,8 @@ def _step_to_next_measure(
 ):
     """Advance each staff_ci to next measure. Return done if
     no more measures anywhere"""
+    from amads.core.basics import Measure
+
     for i in range(len(staff_ci)):
         # advance staff_ci to find Measure
         ci = staff_ci[i] + 1
@@ -650,6 +752,8 @@ def _finish_import(
     collapse: bool,  # shift: float
 ) -> Score:
     """Apply some final manipulations common to m21 and pt import"""
+    from amads.core.basics import Measure, Part, Rest, Staff
+
     # check that time signatures correspond to measures.
     # Music21 does strange things with MusicXML where measures are not full.
     # To fix this, we first develop a list of measure onsets and durations that
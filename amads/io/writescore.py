@@ -1,14 +1,22 @@
 """functions for file output"""
 
+from __future__ import annotations
+
 __author__ = "Roger B. Dannenberg"
 
+import os
+import sys
 import tempfile
+import threading
 import warnings
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
 from pathlib import Path
 from tempfile import mkdtemp
-from typing import Callable, Optional, cast
+from typing import TYPE_CHECKING, Callable, Iterator, Optional, cast
 
-from amads.core.basics import Score
+if TYPE_CHECKING:  # amads.core.basics is only needed once a file is written
+    from amads.core.basics import Score
 
 # This module, writescore, is regarded as a singleton class with
 # the following attributes:
@@ -32,6 +40,21 @@ preferred_pdf_writer: str = (
 writer_warning_level: str = "default"  # controls verbocity of warnings
 #     from output processing
 _last_used_writer: Optional[Callable] = None  # See last_used_writer()
+_background_writer: Optional[ThreadPoolExecutor] = None  # write_score_async()
+# Warning handling of the reads and writes in progress (see _warning_filter):
+# the handlers of each thread (innermost last), the showwarning in effect
+# before the first of them began, the warning filters in effect before the
+# first one at a level other than "default" began, and a lock held while
+# these are changed
+_warning_handlers: dict[int, list[Callable]] = {}
+_saved_showwarning: Optional[Callable] = None
+_saved_warning_state: Optional[warnings.catch_warnings] = None
+_warning_lock = threading.Lock()
+# packages whose warnings are reported again by each read and write at the
+# "default" warning level (see _reset_warning_registries)
+_warning_packages = frozenset(
+    {"amads", "music21", "partitura", "pretty_midi", "mido"}
+)
 
 # mappings from suffix to format:
 _suffix_to_format = {
@@ -77,6 +100,13 @@ allowed_subsystems = {
     ],
 }
 
+# frozen copies of the names accepted by the set_* functions
+_allowed_writers = {
+    format: frozenset(writers) for format, writers in allowed_subsystems.items()
+}
+_midi_writers = frozenset({"music21", "partitura", "pretty_midi", "mido"})
+_warning_levels = frozenset({"none", "low", "default", "high"})
+
 # mapping from preference strings to subsystem callables
 _subsystem_map = {
     "music21": ("amads.io.m21_export", "music21_export"),
@@ -120,7 +150,7 @@ def set_preferred_midi_writer(writer: str = _default_midi_writer) -> str:
     """
     global preferred_midi_writer
     previous_writer = preferred_midi_writer
-    if writer in ["music21", "partitura", "pretty_midi", "mido"]:
+    if writer in _midi_writers:
         preferred_midi_writer = writer
     else:
         raise ValueError(
@@ -155,7 +185,7 @@ def set_preferred_xml_writer(writer: str = _default_xml_writer) -> str:
     """
     global preferred_xml_writer
     previous_writer = preferred_xml_writer
-    if writer in allowed_subsystems["musicxml"]:
+    if writer in _allowed_writers["musicxml"]:
         preferred_xml_writer = writer
     else:
         raise ValueError("Invalid XML writer. Choose 'music21' or 'partitura'.")
@@ -187,7 +217,7 @@ def set_preferred_kern_writer(writer: str = _default_kern_writer) -> str:
     """
     global preferred_kern_writer
     previous_writer = preferred_kern_writer
-    if writer in allowed_subsystems["kern"]:
+    if writer in _allowed_writers["kern"]:
         preferred_kern_writer = writer
     else:
         raise ValueError("Invalid Kern writer. Choose 'music21'.")
@@ -219,7 +249,7 @@ def set_preferred_mei_writer(writer: str = _default_mei_writer) -> str:
     """
     global preferred_mei_writer
     previous_writer = preferred_mei_writer
-    if writer in allowed_subsystems["mei"]:
+    if writer in _allowed_writers["mei"]:
         preferred_mei_writer = writer
     else:
         raise ValueError("Invalid MEI writer. Choose 'music21'.")
@@ -261,7 +291,7 @@ def set_preferred_pdf_writer(writer: str = _default_pdf_writer) -> str:
     """
     global preferred_pdf_writer
     previous_writer = preferred_pdf_writer
-    if writer in allowed_subsystems["pdf"]:
+    if writer in _allowed_writers["pdf"]:
         preferred_pdf_writer = writer
     else:
         raise ValueError(
@@ -307,7 +337,7 @@ def set_writer_warning_level(level: str) -> str:
     """
     global writer_warning_level
     previous_level = writer_warning_level
-    if level in ["none", "low", "default", "high"]:
+    if level in _warning_levels:
         writer_warning_level = level
     else:
         raise ValueError(
@@ -316,6 +346,100 @@ def set_writer_warning_level(level: str) -> str:
     return previous_level
 
 
+def _suffix(filename: str | Path) -> str:
+    """Return the lower-case extension of filename, e.g. ".mid", or "".
+
+    Plain strings are handled with `os.path.splitext`, avoiding the
+    construction of a `Path`.
+    """
+    if isinstance(filename, Path):
+        return filename.suffix.lower()
+    return os.path.splitext(filename)[1].lower()
+
+
+def _dispatch_warning(
+    message, category, filename, lineno, file=None, line=None
+):
+    """Pass a warning to the handler of the thread that issued it.
+
+    This is `warnings.showwarning` while any read or write is in progress.
+    Warnings from other threads go to the `showwarning` it replaced.
+    """
+    handlers = _warning_handlers.get(threading.get_ident())
+    show_warning = handlers[-1] if handlers else _saved_showwarning
+    assert show_warning is not None
+    show_warning(message, category, filename, lineno, file, line)
+
+
+def _ignore_warning(message, category, filename, lineno, file=None, line=None):
+    """Discard a warning (the handler for warning level "none")"""
+
+
+def _reset_warning_registries() -> None:
+    """Forget which warnings the reader and writer packages have issued.
+
+    Under the "default" action of the warning filters, a warning is shown
+    only the first time it is issued from a location, which is recorded
+    in the `__warningregistry__` of the issuing module. Clearing these
+    lets each read or write report its warnings, without changing the
+    filters.
+    """
+    for name, module in list(sys.modules.items()):
+        if name.partition(".")[0] in _warning_packages:
+            registry = getattr(module, "__warningregistry__", None)
+            if registry:
+                registry.clear()
+
+
+@contextmanager
+def _warning_filter(level: str, show_warning: Callable) -> Iterator[None]:
+    """Route warnings to show_warning as implied by a warning level.
+
+    At the "default" level, the warning filters in effect are obeyed, but
+    warnings already shown by earlier reads and writes are shown again
+    (see `_reset_warning_registries`). Otherwise, the filters are replaced
+    so that all warnings are issued, and show_warning gets them unless
+    level is "none".
+
+    The filters and `warnings.showwarning` are global, so they are
+    replaced only when the first of any concurrent reads and writes (e.g.
+    a `read_score` while `write_score_async` is writing) needs them, and
+    restored when the last one ends. In between, `_dispatch_warning` passes
+    each warning to the handler of the thread that issued it, and a read
+    or write at the "default" level also gets all warnings if one at
+    another level is in progress.
+    """
+    global _saved_warning_state, _saved_showwarning
+    thread = threading.get_ident()
+    with _warning_lock:
+        if not _warning_handlers:
+            _saved_showwarning = warnings.showwarning
+            warnings.showwarning = _dispatch_warning
+        if level == "default":
+            _reset_warning_registries()
+        elif _saved_warning_state is None:
+            _saved_warning_state = warnings.catch_warnings()
+            _saved_warning_state.__enter__()
+            warnings.simplefilter("always")
+        _warning_handlers.setdefault(thread, []).append(
+            _ignore_warning if level == "none" else show_warning
+        )
+    try:
+        yield
+    finally:
+        with _warning_lock:
+            handlers = _warning_handlers[thread]
+            handlers.pop()
+            if not handlers:
+                del _warning_handlers[thread]
+            if not _warning_handlers:
+                if _saved_warning_state is not None:
+                    _saved_warning_state.__exit__(None, None, None)
+                    _saved_warning_state = None
+                warnings.showwarning = cast(Callable, _saved_showwarning)
+                _saved_showwarning = None
+
+
 def _check_for_subsystem(
     format: str,
 ) -> tuple[
@@ -356,7 +480,7 @@ def _check_for_subsystem(
     try:
         if (
             preferred_writer not in _subsystem_map
-            or preferred_writer not in allowed_subsystems[format]
+            or preferred_writer not in _allowed_writers[format]
         ):
             raise ValueError(
                 f"Preferred writer '{preferred_writer}' not supported for "
@@ -485,7 +609,7 @@ def _update_format_with_filename(format: Optional[str], filename: Path) -> str:
     """Determine format from filename and check consistency"""
 
     if filename:
-        ext = filename.suffix
+        ext = _suffix(filename)
         implied_format = _suffix_to_format.get(ext)
         if not implied_format:
             raise ValueError(
@@ -604,34 +728,79 @@ def write_score(
             filename = Path(tmp_dir) / ("score" + _format_to_suffix[format])
     format = _update_format_with_filename(format, cast(Path, filename))
 
-    with warnings.catch_warnings(record=True) as w:
-        warnings.simplefilter(
-            "ignore" if writer_warning_level == "none" else "always"
-        )
+    # Warnings are counted (and printed unless the level is "low") as they
+    # are issued rather than recorded in a list.
+    num_warnings = 0
+
+    def _show_warning(message, category, path, lineno, file=None, line=None):
+        nonlocal num_warnings
+        num_warnings += 1
+        if writer_warning_level != "low":
+            formatted = warnings.formatwarning(message, category, path, lineno)
+            print(formatted, end="")
+
+    with _warning_filter(writer_warning_level, _show_warning):
         # format is guaranteed to be a Path here
         _export_score(score, filename, cast(str, format), show)  # type: ignore
 
-        # Warning handling
-        if writer_warning_level == "low":
-            if len(w) > 0:
-                print(
-                    f"Warning: {len(w)} warnings were generated in"
-                    f" write_score({filename}). Use"
-                    " amads.io.writescore.set_writer_warning_level() for"
-                    " more details."
-                )
-        else:  # "none", "default", or "high"
-            for warning in w:
-                formatted = warnings.formatwarning(
-                    warning.message,
-                    warning.category,
-                    warning.filename,
-                    warning.lineno,
-                )
-                print(formatted, end="")
+    # Warning handling ("none" never gets here with num_warnings > 0)
+    if writer_warning_level == "low" and num_warnings > 0:
+        print(
+            f"Warning: {num_warnings} warnings were generated in"
+            f" write_score({filename}). Use"
+            " amads.io.writescore.set_writer_warning_level() for"
+            " more details."
+        )
     return cast(Path, filename)
 
 
+def write_score_async(
+    score: Score,
+    filename: str | Path | None,
+    show: bool = False,
+    format: Optional[str] = None,
+    is_temp: bool = False,
+) -> Future[Path]:
+    """Write a file with the given format in a background thread.
+
+    This is `write_score` run by a background writer thread, so that the
+    caller can go on (e.g. build the next Score) while the file is
+    encoded and written. Writes are performed one at a time in the order
+    they were requested, because the underlying subsystems are not
+    thread-safe. Reads (e.g. with `read_score`) can go on at the same
+    time, and the warnings of each read or write are reported by that
+    call. Do not modify `score` until the write is done.
+
+    Parameters
+    ----------
+    score : Score
+        the score to write
+    filename : str | Path | None
+        the path (relative or absolute) to the music file. See `write_score`.
+    show : bool
+        print a text representation of the data
+    format : Optional[string]
+        one of `'musicxml'`, `'midi'`, `'kern'`, `'mei'`, `'pdf'`, `'lilypond'`.
+        Defaults to the format implied by `filename`.
+    is_temp: bool
+        See `write_score`.
+
+    Returns
+    -------
+    Future[Path]
+        A future whose `result()` is the path to which the data was written,
+        or which raises the exception raised by `write_score`.
+    """
+    global _background_writer
+    if _background_writer is None:
+        _background_writer = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="amads_writer"
+        )
+    return _background_writer.submit(
+        write_score, score, filename, show, format, is_temp
+    )
+
+
 def last_used_writer() -> Optional[str]:
     """Return the name of the last used writer function.
 
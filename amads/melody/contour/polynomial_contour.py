@@ -1,6 +1,10 @@
+import math
+from functools import lru_cache
 from typing import Optional, Sequence
 
 import numpy as np
+from numpy.polynomial.polynomial import polyval
+from scipy.linalg import get_lapack_funcs, lstsq
 
 from amads.core.basics import Score
 from amads.core.pitch import Pitch
@@ -76,6 +80,15 @@ class PolynomialContour:
     >>> [round(x, 7) for x in test_2.coefficients]  # Verified against FANTASTIC toolbox
     [-1.5014826, -0.2661533, 0.122057]
 
+    Onsets and pitches can also be given as numpy arrays. When several
+    features are computed from one score, extracting the notes once and
+    passing them in this way avoids walking the score again:
+
+    >>> test_3 = PolynomialContour(onsets=np.array(test_onsets),
+    ...                            pitches=np.array(test_pitches))
+    >>> test_3.coefficients == test_2.coefficients
+    True
+
     >>> twinkle = Score.from_melody([60, 60, 67, 67, 69, 69, 67, 65, 65, 64, 64, 62, 62, 60],
     ... [1.0, 1.0, 1.0, 1.0, 1.0, 1.0, 2.0, 1.0, 1.0, 1.0, 1.0, 1.0, 1.0, 2.0])
     >>> pc3 = PolynomialContour(twinkle)
@@ -86,8 +99,8 @@ class PolynomialContour:
     def __init__(
         self,
         score: Optional[Score] = None,
-        onsets: Optional[Sequence[float]] = None,
-        pitches: Optional[Sequence[int]] = None,
+        onsets: Optional[Sequence[float] | np.ndarray] = None,
+        pitches: Optional[Sequence[int] | np.ndarray] = None,
     ):
         none_checks = (onsets is not None, pitches is not None)
         if any(none_checks) and not all(none_checks):
@@ -101,8 +114,8 @@ class PolynomialContour:
                     f"onsets and pitches must have the same length, "
                     f"got {len(onsets)} and {len(pitches)}."
                 )
-            self.onsets = list(onsets)
-            self.pitches = list(pitches)
+            self.onsets = np.asarray(onsets, dtype=np.float64).tolist()
+            self.pitches = np.asarray(pitches).tolist()
         else:
             if score is None:
                 raise ValueError(
@@ -113,12 +126,73 @@ class PolynomialContour:
 
             self.onsets, self.pitches = self.get_onsets_and_pitches(score)
 
-        self.coefficients = self.calculate_coefficients(
-            self.onsets, self.pitches
+        self.coefficients = list(
+            _cached_coefficients(tuple(self.onsets), tuple(self.pitches))
         )
 
+    @classmethod
+    def batch(cls, scores: Sequence[Score]) -> list["PolynomialContour"]:
+        """Compute the polynomial contours of many melodies.
+
+        The result is the same (up to rounding errors) as
+        `[PolynomialContour(s) for s in scores]`, but melodies with the
+        same (centered) onset times, which are common in a corpus of
+        phrases, are fitted together: they share one design matrix and
+        factorization, and each candidate model is fitted to all of them at
+        once.
+
+        Parameters
+        ----------
+        scores : Sequence[Score]
+            The melodies to analyze
+
+        Returns
+        -------
+        list[PolynomialContour]
+            The polynomial contour of each score, in the same order
+
+        Examples
+        --------
+        >>> phrases = [Score.from_melody([60, 62, 64, 62, 60, 59]),
+        ...            Score.from_melody([67, 65, 64, 62, 60, 60]),
+        ...            Score.from_melody([60, 64, 67], [1.0, 1.0, 2.0])]
+        >>> contours = PolynomialContour.batch(phrases)
+        >>> for c in contours:
+        ...     print([round(x, 7) for x in c.coefficients])
+        [-1.166336, -0.5535714, 0.1574074]
+        [-1.8597884, 0.1071429, 0.0740741]
+        [3.5, 0.0, 0.0]
+        >>> [round(x, 7) for x in PolynomialContour(phrases[1]).coefficients]
+        [-1.8597884, 0.1071429, 0.0740741]
+        """
+        contours = []
+        # melodies grouped by their centered onset times:
+        groups: dict[tuple[float, ...], list[PolynomialContour]] = {}
+        for score in scores:
+            if not isinstance(score, Score):
+                raise TypeError("Score should be a Score object.")
+            contour = cls.__new__(cls)  # coefficients are computed below
+            contour.onsets, contour.pitches = contour.get_onsets_and_pitches(
+                score
+            )
+            contour.coefficients = [0.0, 0.0, 0.0]  # for fewer than 2 notes
+            contours.append(contour)
+            if len(contour.onsets) > 1:
+                centered = tuple(contour.center_onset_times(contour.onsets))
+                groups.setdefault(centered, []).append(contour)
+
+        for centered, group in groups.items():
+            pitches = np.array([c.pitches for c in group], dtype=np.float64)
+            best = cls._select_models(
+                np.array(centered), pitches.T, len(centered) // 2
+            )
+            for contour, coefficients in zip(group, best):
+                contour.coefficients = coefficients.tolist()
+        return contours
+
+    @staticmethod
     def calculate_coefficients(
-        self, onsets: list[float], pitches: list[int]
+        onsets: list[float], pitches: list[int]
     ) -> list[float]:
         """Calculate polynomial contour coefficients for the melody.
         Main method for the PolynomialContour class.
@@ -140,18 +214,21 @@ class PolynomialContour:
         if len(onsets) <= 1:
             return [0.0, 0.0, 0.0]
 
+        # Convert to float64 arrays once; the helpers below use them as is
+        onsets_array = np.asarray(onsets, dtype=np.float64)
+        pitches_array = np.asarray(pitches, dtype=np.float64)
+
         # Center onset times
-        centered_onsets = self.center_onset_times(onsets)
+        centered_onsets = PolynomialContour.center_onset_times(onsets_array)
 
         # Calculate polynomial degree
         m = len(onsets) // 2
 
         # Select best model using BIC
-        return self.select_model(centered_onsets, pitches, m)
+        return PolynomialContour.select_model(centered_onsets, pitches_array, m)
 
-    def get_onsets_and_pitches(
-        self, score: Score
-    ) -> tuple[list[float], list[int]]:
+    @staticmethod
+    def get_onsets_and_pitches(score: Score) -> tuple[list[float], list[int]]:
         """Extract onset times and pitches from a Score object.
 
         Parameters
@@ -167,7 +244,8 @@ class PolynomialContour:
         notes = score.get_sorted_notes()
         return [note.onset for note in notes], [note.midi_num for note in notes]
 
-    def center_onset_times(self, onsets: list[float]) -> list[float]:
+    @staticmethod
+    def center_onset_times(onsets: Sequence[float] | np.ndarray) -> np.ndarray:
         """Center onset times around their midpoint. This produces a symmetric axis
         of onset times, which is used later to fit the polynomial.
 
@@ -176,23 +254,28 @@ class PolynomialContour:
 
         Parameters
         ----------
-        onsets : list[float]
-            List of onset times to center
+        onsets : Sequence[float] | np.ndarray
+            Onset times to center
 
         Returns
         -------
-        list[float]
-            List of centered onset times. Returns [0.0] for single-note melodies.
+        np.ndarray
+            Centered onset times (float64). Returns [0.0] for single-note
+            melodies.
         """
+        onsets = np.asarray(onsets, dtype=np.float64)
         if len(onsets) <= 1:
-            return [0.0] * len(onsets)
+            return np.zeros(len(onsets))
 
         # Calculate midpoint using first and last onset times
         midpoint = (onsets[0] + onsets[-1]) / 2
-        return [time - midpoint for time in onsets]
+        return onsets - midpoint
 
+    @staticmethod
     def fit_polynomial(
-        self, centered_onsets: list[float], pitches: list[int], m: int
+        centered_onsets: Sequence[float] | np.ndarray,
+        pitches: Sequence[float] | np.ndarray,
+        m: int,
     ) -> list[float]:
         """
         Fit a polynomial model to the melody contour using least squares regression.
@@ -204,10 +287,10 @@ class PolynomialContour:
 
         Parameters
         ----------
-        centered_onsets : list[float]
-            List of centered onset times
-        pitches : list[int]
-            List of pitch values
+        centered_onsets : Sequence[float] | np.ndarray
+            Centered onset times
+        pitches : Sequence[float] | np.ndarray
+            Pitch values
         m : int
             Maximum polynomial degree to use
 
@@ -222,23 +305,30 @@ class PolynomialContour:
             return [float(pitches[0]) if n == 1 else 0.0]
 
         # Create predictor matrix X where each column is t^i
-        x = np.array(
-            [[t**i for i in range(m + 1)] for t in centered_onsets], dtype=float
+        x = np.vander(
+            np.asarray(centered_onsets, dtype=np.float64),
+            m + 1,
+            increasing=True,
         )
-        y = np.array(pitches, dtype=float)
+        y = np.asarray(pitches, dtype=np.float64)
 
-        # Use numpy's least squares solver
-        coeffs = np.linalg.lstsq(x, y, rcond=None)[0]
+        # QR-based least squares (LAPACK gelsy) is much cheaper than the
+        # SVD-based default for these small, tall design matrices
+        coeffs = lstsq(x, y, lapack_driver="gelsy", check_finite=False)[0]
 
         return coeffs.tolist()
 
+    @staticmethod
     def select_model(
-        self, centered_onsets: list[float], pitches: list[int], m: int
+        centered_onsets: Sequence[float] | np.ndarray,
+        pitches: Sequence[float] | np.ndarray,
+        m: int,
     ) -> list[float]:
         """Select the best polynomial model using BIC in an exhaustive search
         over all subsets of polynomial terms.
 
-        Tests all 2^(m+1) - 1 combinations of polynomial terms and selects
+        Tests all 2^m - 1 non-empty combinations of the non-constant
+        polynomial terms (the constant term is always included) and selects
         the one with the best (lowest) BIC. The max degree is m = n // 2.
 
         Note: the search space grows as O(2^m).
@@ -247,10 +337,10 @@ class PolynomialContour:
 
         Parameters
         ----------
-        centered_onsets : list[float]
-            List of centered onset times
-        pitches : list[int]
-            List of pitch values
+        centered_onsets : Sequence[float] | np.ndarray
+            Centered onset times
+        pitches : Sequence[float] | np.ndarray
+            Pitch values
         m : int
             Maximum polynomial degree to consider
 
@@ -260,62 +350,197 @@ class PolynomialContour:
             The coefficients [c1, c2, c3] of the selected polynomial model,
             padded with zeros if the selected degree is less than 3.
         """
-        max_degree = m
-        pitches_array = np.array(pitches, dtype=float)
-        x_full = np.array(
-            [[t**i for i in range(max_degree + 1)] for t in centered_onsets]
+        pitches_array = np.asarray(pitches, dtype=np.float64)
+        best = PolynomialContour._select_models(
+            centered_onsets, pitches_array[:, np.newaxis], m
         )
+        return best[0].tolist()
+
+    @staticmethod
+    def _select_models(
+        centered_onsets: Sequence[float] | np.ndarray,
+        pitches: np.ndarray,
+        m: int,
+    ) -> np.ndarray:
+        """Select the best polynomial models of melodies sharing onset times.
+
+        This is `select_model` for k melodies at once: column i of the
+        (n, k) `pitches` array holds the pitches of melody i. The melodies
+        share the design matrix and its factorization, and each candidate
+        model is fitted to all of them with a single least-squares call.
+
+        Parameters
+        ----------
+        centered_onsets : Sequence[float] | np.ndarray
+            Centered onset times, shared by all melodies
+        pitches : np.ndarray
+            (n, k) float64 array of pitch values, one column per melody
+        m : int
+            Maximum polynomial degree to consider
 
-        # Start with maximum degree model
-        best_fit = self.fit_polynomial(centered_onsets, pitches, m)
-        # Pad to at least degree-3 so indexing [1],[2],[3] is always safe
-        best_coeffs = np.zeros(max(max_degree + 1, 4))
-        best_coeffs[: len(best_fit)] = best_fit
-        best_bic = self._calculate_bic(
-            best_coeffs[: max_degree + 1], x_full, pitches_array
+        Returns
+        -------
+        np.ndarray
+            (k, 3) array, where row i holds the coefficients [c1, c2, c3]
+            of the model selected for melody i.
+        """
+        max_degree = m
+        # Keep float64: powers of the onsets up to t^m span many orders of
+        # magnitude, and in float32 the BIC comparisons between candidate
+        # models are decided by rounding errors, selecting different models.
+        x_full = np.vander(
+            np.asarray(centered_onsets, dtype=np.float64),
+            max_degree + 1,
+            increasing=True,
         )
 
-        for i in range(1, 2 ** (max_degree + 1)):
-            binary = format(i, f"0{max_degree + 1}b")
-            degrees = [j for j in range(1, max_degree + 1) if binary[j] == "1"]
+        n, k = pitches.shape
+
+        # One QR factorization of x_full serves all candidate models. With
+        # x_full = q @ r, fitting any subset of the columns of x_full to y
+        # is the same as fitting those columns of r to q.T @ y, a system of
+        # only m + 1 rows, and the RSS of the fit is the RSS of that small
+        # system plus rss_full, the part of y outside the span of x_full.
+        q, r = np.linalg.qr(x_full)
+        # LAPACK works on column-major arrays. In Fortran order, the column
+        # selections r[:, columns] (and qty) can be passed to LAPACK without
+        # being copied into column-major layout on every call.
+        r = np.asfortranarray(r)
+        qty = np.asfortranarray(q.T @ pitches)
+        residuals = pitches - q @ qty
+        # column-wise dot products, i.e. the RSS of each melody
+        rss_full = np.einsum("ij,ij->j", residuals, residuals)
+
+        # The candidate fits are tiny, so the argument checking and workspace
+        # query done by scipy.linalg.lstsq on every call would cost more than
+        # the solve itself. Bind the LAPACK routine it uses (gelsy) once and
+        # call it directly. The workspace for the largest (full) model is
+        # large enough for every subset.
+        gelsy, gelsy_lwork = get_lapack_funcs(("gelsy", "gelsy_lwork"), (r,))
+        rcond = np.finfo(np.float64).eps  # lstsq's default
+        lwork = int(gelsy_lwork(max_degree + 1, max_degree + 1, k, rcond)[0])
+
+        def fit_and_score(columns: list[int]) -> tuple[np.ndarray, np.ndarray]:
+            """Fit the model made of columns of x_full to every melody;
+            return (coeffs, BIC) with one column/element per melody"""
+            x = r[:, columns]
+            jpvt = np.zeros((len(columns), 1), dtype=np.int32)
+            _, solution, _, _, info = gelsy(x, qty, jpvt, rcond, lwork)
+            if info < 0:
+                raise ValueError(f"illegal argument {-info} to LAPACK gelsy")
+            coeffs = solution[: len(columns)]
+            # predictions use only the active columns (no zero padding) and
+            # the RSS is a dot product, avoiding a squared temporary array
+            residuals = x @ coeffs - qty
+            rss = rss_full + np.einsum("ij,ij->j", residuals, residuals)
+            return coeffs, PolynomialContour._calculate_bic(
+                rss, n, PolynomialContour._count_params(coeffs)
+            )
 
-            if not degrees:
-                continue
+        # The intercept is always included, so each non-empty subset of the
+        # degrees 1..m is one candidate, starting with the full model (all
+        # degrees) and followed by the others in binary counting order,
+        # where bit m - j of the count selects degree j.
+        counts = np.arange(1, 2**max_degree - 1)
+        bits = (counts[:, np.newaxis] >> np.arange(max_degree - 1, -1, -1)) & 1
+        candidates = [list(range(max_degree + 1))] + [
+            [0] + (np.flatnonzero(row) + 1).tolist() for row in bits
+        ]
 
-            x = np.ones((len(centered_onsets), len(degrees) + 1))
-            for j, degree in enumerate(degrees):
-                x[:, j + 1] = [t**degree for t in centered_onsets]
+        # Once every melody's best model scores min_bic (e.g. a repeated
+        # note, fitted perfectly by the intercept), the search is over,
+        # since a model has to be strictly better to be selected.
+        min_bic = PolynomialContour._min_bic(x_full, pitches)
+
+        # Score every candidate, keeping only the BICs, then select the
+        # best model of each melody with one argmin. argmin picks the first
+        # of equal BICs, so a model is only selected over an earlier
+        # candidate when it is strictly better.
+        bics = np.empty((len(candidates), k))
+        best_bic = np.full(k, np.inf)
+        for i, columns in enumerate(candidates):
+            bics[i] = fit_and_score(columns)[1]
+            best_bic = np.minimum(best_bic, bics[i])
+            if (best_bic <= min_bic).all():
+                bics = bics[: i + 1]
+                break
+        selected = np.argmin(bics, axis=0)
+
+        # Refit the selected models, once per distinct model, and build
+        # the coefficient arrays (padded to at least degree 3 so indexing
+        # [1],[2],[3] is always safe)
+        best_coeffs = np.zeros((max(max_degree + 1, 4), k))
+        for i in np.unique(selected):
+            columns = candidates[i]
+            melodies = selected == i
+            coeffs = fit_and_score(columns)[0]
+            best_coeffs[np.ix_(columns, melodies)] = coeffs[:, melodies]
+
+        return best_coeffs[1:4].T
+
+    @staticmethod
+    def _min_bic(x_full: np.ndarray, pitches: np.ndarray) -> np.ndarray:
+        """Bound the BIC of every candidate model from below.
+
+        A model with parameters reaches at best the RSS floor of
+        `_calculate_bic`. A model with none has all coefficients c within
+        1e-10 of 0 (see `_count_params`), but its fit x @ c is not
+        necessarily small: the columns t**j of x_full can be huge for long
+        melodies. Its norm is at most 1e-10 times the sum of the column
+        norms, so the RSS is at least (|y| - that)**2.
 
-            coeffs = np.linalg.lstsq(x, pitches_array, rcond=None)[0]
+        Parameters
+        ----------
+        x_full : np.ndarray
+            (n, m + 1) design matrix of the full model
+        pitches : np.ndarray
+            (n, k) array of pitch values, one column per melody
 
-            # Build a full coefficient array (padded to at least degree 3)
-            test_coeffs = np.zeros(max(max_degree + 1, 4))
-            test_coeffs[0] = coeffs[0]
-            for j, degree in enumerate(degrees):
-                test_coeffs[degree] = coeffs[j + 1]
+        Returns
+        -------
+        np.ndarray
+            Lower bound on the BIC of any candidate for each melody
+        """
+        n, k = pitches.shape
+        max_fit = 1e-10 * np.linalg.norm(x_full, axis=0).sum()
+        norms = np.sqrt(np.einsum("ij,ij->j", pitches, pitches))
+        # the margin keeps rounding errors in the fitted RSS from
+        # undercutting the bound
+        rss_none = np.maximum(norms - max_fit, 0.0) ** 2 * (1 - 1e-9)
+        return np.minimum(
+            PolynomialContour._calculate_bic(np.zeros(k), n, np.ones(k)),
+            PolynomialContour._calculate_bic(rss_none, n, np.zeros(k)),
+        )
 
-            bic = self._calculate_bic(
-                test_coeffs[: max_degree + 1], x_full, pitches_array
-            )
+    @staticmethod
+    def _count_params(coeffs: np.ndarray) -> np.ndarray:
+        """Count the parameters of fitted models for `_calculate_bic`.
 
-            if bic < best_bic:
-                best_coeffs = test_coeffs
-                best_bic = bic
+        Only non-zero coefficients are counted as parameters, emulating
+        the FANTASTIC toolbox.
 
-        return [
-            best_coeffs[1].item(),  # convert to native float
-            best_coeffs[2].item(),
-            best_coeffs[3].item(),
-        ]
+        Parameters
+        ----------
+        coeffs : np.ndarray
+            The fitted coefficients of the models' terms only (not padded),
+            one column per model
+
+        Returns
+        -------
+        np.ndarray
+            Number of coefficients with magnitude above 1e-10 in each column
+        """
+        return np.count_nonzero(np.abs(coeffs) > 1e-10, axis=0)
 
+    @staticmethod
     def _calculate_bic(
-        self, coeffs: np.ndarray, x: np.ndarray, y: np.ndarray
-    ) -> float:
-        """Calculate BIC for a set of coefficients.
+        rss: np.ndarray, n: int, n_params: np.ndarray
+    ) -> np.ndarray:
+        """Calculate BIC for fitted models.
 
         Emulates the FANTASTIC toolbox implementation, which uses stepAIC from
         the MASS package in R. Only non-zero coefficients are counted as
-        parameters.
+        parameters (see `_count_params`).
 
         If the max value is 0, then a small epsilon is added to RSS.
         We do this before taking the log to guard against
@@ -323,28 +548,21 @@ class PolynomialContour:
 
         Parameters
         ----------
-        coeffs : np.ndarray
-            Coefficient array (length must match x.shape[1])
-        x : np.ndarray
-            Predictor matrix
-        y : np.ndarray
-            Response vector
+        rss : np.ndarray
+            Residual sum of squares of each model
+        n : int
+            Number of observations (notes)
+        n_params : np.ndarray
+            Number of parameters of each model
 
         Returns
         -------
-        float
-            BIC value
+        np.ndarray
+            BIC value of each model
         """
-        predictions = np.dot(x, coeffs)
-        residuals = predictions - y
-        rss = np.sum(residuals**2)
-        rss = max(rss, 1e-10)  # guard against log(0) on perfect fits
-        n = len(y)
-
-        # Count only non-zero coefficients as parameters
-        n_params = np.sum(np.abs(coeffs) > 1e-10)
-
-        return n * np.log(rss / n) + n_params * np.log(n)
+        rss = np.maximum(rss, 1e-10)  # guard against log(0) on perfect fits
+        # log(n) is a scalar: math.log avoids the ufunc dispatch of np.log
+        return n * np.log(rss / n) + n_params * math.log(n)
 
     def plot(self, ax=None):
         """Plot the melody contour and the fitted polynomial curve.
@@ -384,16 +602,16 @@ class PolynomialContour:
         pitches = self.pitches
         centered_onsets = self.center_onset_times(onsets)
 
-        t = np.array(centered_onsets)
+        t = centered_onsets
         c1, c2, c3 = self.coefficients
 
         # Recover the constant term c0 (not stored per FANTASTIC spec) as the
         # mean of the residuals after subtracting the known polynomial terms.
-        poly_terms = c1 * t + c2 * t**2 + c3 * t**3
+        poly_terms = polyval(t, [0.0, c1, c2, c3])
         c0 = float(np.mean(np.array(pitches, dtype=float) - poly_terms))
 
         t_smooth = np.linspace(t[0], t[-1], 300) if len(t) > 1 else t.copy()
-        fit_curve = c0 + c1 * t_smooth + c2 * t_smooth**2 + c3 * t_smooth**3
+        fit_curve = polyval(t_smooth, [c0, c1, c2, c3])
 
         if ax is None:
             _, ax = plt.subplots(figsize=(8, 4))
@@ -434,3 +652,18 @@ class PolynomialContour:
         ax.spines[["top", "right"]].set_visible(False)
 
         return ax
+
+
+@lru_cache(maxsize=1024)
+def _cached_coefficients(
+    onsets: tuple[float, ...], pitches: tuple[float, ...]
+) -> tuple[float, ...]:
+    """Memoized `PolynomialContour.calculate_coefficients`.
+
+    The same melodies (and phrases) are often analyzed many times, and a
+    melody of n notes is tiny to hash compared to the cost of searching
+    2^(n // 2) models, so PolynomialContour looks up its coefficients here.
+    """
+    return tuple(
+        PolynomialContour.calculate_coefficients(list(onsets), list(pitches))
+    )
@@ -6,6 +6,8 @@ Juhász (2000) [3], Eerola and Toiviainen (2004) [4].
 
 __author__ = "David Whyatt"
 
+from typing import Sequence
+
 import numpy as np
 
 
@@ -48,18 +50,18 @@ class StepContour:
 
     def __init__(
         self,
-        pitches: list[int],
-        durations: list[float],
+        pitches: Sequence[int] | np.ndarray,
+        durations: Sequence[float] | np.ndarray,
         step_contour_length: int = _step_contour_length,
     ):
         """Initialize StepContour with melody data.
 
         Parameters
         ----------
-        pitches : list[int]
-            List of pitch values in any numeric format (e.g., MIDI numbers).
-        durations : list[float]
-            List of note durations measured in tatums
+        pitches : Sequence[int] | np.ndarray
+            Pitch values in any numeric format (e.g., MIDI numbers).
+        durations : Sequence[float] | np.ndarray
+            Note durations measured in tatums
         step_contour_length : int, optional
             Length of the output step contour vector (default is 64)
 
@@ -81,6 +83,12 @@ class StepContour:
         >>> sc = StepContour([60, 62], [2.0, 2.0], step_contour_length=4)
         >>> sc.contour
         [60, 60, 62, 62]
+
+        Pitches and durations can also be numpy arrays:
+
+        >>> sc = StepContour(np.array([60, 62]), np.array([2.0, 2.0]), 4)
+        >>> sc.contour == [60, 60, 62, 62]
+        True
         """
         if len(pitches) != len(durations):
             raise ValueError(
@@ -91,14 +99,16 @@ class StepContour:
         self._step_contour_length = step_contour_length
         self.contour = self._calculate_contour(pitches, durations)
 
-    def _normalize_durations(self, durations: list[float]) -> list[float]:
+    def _normalize_durations(
+        self, durations: Sequence[float] | np.ndarray
+    ) -> list[float]:
         """Helper function to normalize note durations to fit within 4 bars of 4/4 time
         (64 tatums total by default).
 
         Parameters
         ----------
-        durations : list[float]
-            List of duration values measured in tatums
+        durations : Sequence[float] | np.ndarray
+            Duration values measured in tatums
 
         Returns
         -------
@@ -111,21 +121,20 @@ class StepContour:
         >>> sc._normalize_durations([2.0, 2.0])
         [32.0, 32.0]
         """
-        total_duration = sum(durations)
+        durations = np.asarray(durations, dtype=np.float64)
+        # cumsum adds in order, so the total is exactly that of sum()
+        total_duration = np.cumsum(durations)[-1] if len(durations) else 0.0
         if total_duration == 0:
             raise ValueError("Total duration is 0, cannot normalize")
 
-        normalized = [
-            self._step_contour_length * (duration / total_duration)
-            for duration in durations
-        ]
-        return normalized
+        normalized = self._step_contour_length * (durations / total_duration)
+        return normalized.tolist()
 
     @classmethod
     def _expand_to_vector(
         cls,
-        pitches: list[int],
-        normalized_durations: list[float],
+        pitches: Sequence[int] | np.ndarray,
+        normalized_durations: Sequence[float] | np.ndarray,
         step_contour_length: int,
     ) -> list[int]:
         """Helper function that resamples the melody to a vector of length
@@ -133,10 +142,10 @@ class StepContour:
 
         Parameters
         ----------
-        pitches : list[int]
-            List of pitch values
-        normalized_durations : list[float]
-            List of normalized duration values (should sum to step_contour_length)
+        pitches : Sequence[int] | np.ndarray
+            Pitch values
+        normalized_durations : Sequence[float] | np.ndarray
+            Normalized duration values (should sum to step_contour_length)
         step_contour_length : int
             Length of the output step contour vector
 
@@ -150,41 +159,32 @@ class StepContour:
         >>> StepContour._expand_to_vector([60, 62], [2.0, 2.0], step_contour_length=4)
         [60, 60, 62, 62]
         """
-        if abs(sum(normalized_durations) - step_contour_length) > 1e-6:
+        # offsets (ends) of the notes; cumsum adds in order like sum()
+        offsets = np.cumsum(np.asarray(normalized_durations, dtype=np.float64))
+        total_duration = offsets[-1] if len(offsets) else 0.0
+        if abs(total_duration - step_contour_length) > 1e-6:
             raise ValueError(
-                f"The sum of normalized_durations ({sum(normalized_durations)}) must "
+                f"The sum of normalized_durations ({total_duration}) must "
                 f"be equal to the step contour length ({step_contour_length})"
             )
         # We interpret the output list as a vector of pitch samples taken
         # at times 0, 1, 2, ..., 63 where 63 = step_contour_length - 1
         # and the length of the normalized melody is 64.
-
-        output_length = step_contour_length
-        output_pitches = [None for _ in range(output_length)]
-        output_times = list(range(output_length))
-
-        output_index = 0
-        offset = 0.0
-
-        # Iterate over the input pitches and durations
-        for sounding_pitch, duration in zip(pitches, normalized_durations):
-            offset += duration
-
-            while True:
-                # Step through the output list, and populate any time slots that
-                # are occupied by the current note.
-                if output_index >= output_length:
-                    break
-                output_time = output_times[output_index]
-                if output_time >= offset:
-                    break
-                output_pitches[output_index] = sounding_pitch
-                output_index += 1
-
-        return output_pitches
+        # The pitch sampled at time t is that of the first note ending
+        # after t; samples past the last offset (by rounding) are None.
+        note_indices = np.searchsorted(
+            offsets, np.arange(step_contour_length), side="right"
+        )
+        pitches = list(pitches)
+        return [
+            pitches[i] if i < len(pitches) else None
+            for i in note_indices.tolist()
+        ]
 
     def _calculate_contour(
-        self, pitches: list[int], durations: list[float]
+        self,
+        pitches: Sequence[int] | np.ndarray,
+        durations: Sequence[float] | np.ndarray,
     ) -> list[int]:
         """Calculate the step contour from input pitches and durations.
 
@@ -1,5 +1,9 @@
-from collections import Counter
-from typing import Dict
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from operator import attrgetter
+from typing import Dict, Iterable, Optional
 
 import numpy as np
 
@@ -11,10 +15,36 @@ from amads.melody.contour.interpolation_contour import InterpolationContour
 from amads.melody.contour.parsons_contour import ParsonsContour
 from amads.melody.contour.polynomial_contour import PolynomialContour
 from amads.melody.contour.step_contour import StepContour
-from amads.melody.segment import fantastic_segmenter
+from amads.melody.segment import fantastic_segmenter_notes
 
 __author__ = "David Whyatt"
 
+# FANTASTIC normalizes entropies by the log of the alphabet size: 24 pitches
+# (two octaves) and 23 absolute intervals
+_INV_LOG2_24 = 1.0 / math.log2(24)
+_INV_LOG2_23 = 1.0 / math.log2(23)
+
+# attrgetter follows the attribute chains in C, faster than comprehensions
+_get_pitch = attrgetter("pitch.midi_num")
+_get_onset = attrgetter("onset")
+_get_duration = attrgetter("duration")
+
+
+def _extract_notes(
+    score: Score,
+) -> tuple[list[float], list[float], list[float]]:
+    """Return the pitches, onsets and durations of the notes of a melody.
+
+    This is the one traversal of the score that the feature functions
+    need; `fantastic_all_features` shares it between all of them.
+    """
+    notes = score.get_sorted_notes()
+    return (
+        list(map(_get_pitch, notes)),
+        list(map(_get_onset, notes)),
+        list(map(_get_duration, notes)),
+    )
+
 
 def fantastic_pitch_features(score: Score) -> Dict:
     """Extract pitch features from a melody.
@@ -35,27 +65,26 @@ def fantastic_pitch_features(score: Score) -> Dict:
             - pitch_std: The standard deviation of the pitches in the melody.
             - pitch_entropy: A variant of the Shannon entropy of the pitches in the melody.
     """
-    notes = score.get_sorted_notes()
+    pitches, _, _ = _extract_notes(score)
+    return _pitch_features(pitches)
 
-    pitches = [note.pitch.midi_num for note in notes]
 
-    pitch_range = max(pitches) - min(pitches)
+def _pitch_features(pitches: list[float]) -> Dict:
+    """`fantastic_pitch_features` of the given (sorted) pitches"""
+    pitches = np.array(pitches)
+
+    pitch_range = np.ptp(pitches).item()
     pitch_std = np.std(pitches)
 
     # Calculate pitch entropy using Shannon's formula
     # First get frequency distribution of pitches
-    pitch_counts = Counter(pitches)
-    total_pitches = len(pitches)
+    _, pitch_counts = np.unique(pitches, return_counts=True)
 
     # Calculate relative frequencies
-    pitch_freqs = {
-        p: count / total_pitches for p, count in pitch_counts.items()
-    }
+    pitch_freqs = pitch_counts / len(pitches)
 
     # Calculate entropy using the formula from the FANTASTIC toolbox
-    pitch_entropy = -sum(
-        f * np.log2(f) for f in pitch_freqs.values()
-    ) / np.log2(24)
+    pitch_entropy = -np.sum(pitch_freqs * np.log2(pitch_freqs)) * _INV_LOG2_24
 
     return {
         "pitch_range": pitch_range,
@@ -85,34 +114,43 @@ def fantastic_pitch_interval_features(score: Score) -> Dict:
             - modal_interval: The modal absolute pitch interval in the melody.
             - interval_entropy: A variant of the Shannon entropy of the absolute pitch intervals in the melody.
     """
-    notes = score.get_sorted_notes()
+    pitches, _, _ = _extract_notes(score)
+    return _pitch_interval_features(pitches)
 
-    pitches = [note.pitch.midi_num for note in notes]
-    # Fantastic defines intervals by looking forwards
-    intervals = [pitches[i + 1] - pitches[i] for i in range(len(pitches) - 1)]
-    # and then always uses the absolute value
-    abs_intervals = [abs(interval) for interval in intervals]
 
-    absolute_interval_range = max(abs_intervals) - min(abs_intervals)
+def _pitch_interval_features(pitches: list[float]) -> Dict:
+    """`fantastic_pitch_interval_features` of the given (sorted) pitches"""
+    # Fantastic defines intervals by looking forwards, and then always uses
+    # the absolute value; every statistic below comes from this one array
+    abs_intervals = np.abs(np.diff(np.array(pitches)))
+
+    absolute_interval_range = np.ptp(abs_intervals).item()
     mean_absolute_interval = np.mean(abs_intervals)
     std_absolute_interval = np.std(abs_intervals)
-    modal_interval = max(set(abs_intervals), key=abs_intervals.count)
 
     # Calculate interval entropy using Shannon's formula
-    # First get frequency distribution of intervals
-    interval_counts = Counter(abs_intervals)
-    total_intervals = len(abs_intervals)
+    # First get frequency distribution of intervals (the values are sorted,
+    # so argmax picks the smallest of equally common intervals). Intervals
+    # between integer pitches are counted by bincount in one linear pass;
+    # np.unique, which sorts, handles fractional (microtonal) intervals.
+    if abs_intervals.dtype.kind in "iu":
+        interval_counts = np.bincount(abs_intervals)
+        interval_values = np.flatnonzero(interval_counts)
+        interval_counts = interval_counts[interval_values]
+    else:
+        interval_values, interval_counts = np.unique(
+            abs_intervals, return_counts=True
+        )
+    modal_interval = interval_values[np.argmax(interval_counts)].item()
 
     # Calculate relative frequencies
-    interval_freqs = {
-        i: count / total_intervals for i, count in interval_counts.items()
-    }
+    interval_freqs = interval_counts / len(abs_intervals)
 
     # Calculate entropy using the formula from the FANTASTIC toolbox
     # Note that the maximum number of different intervals is instead 23 here
-    interval_entropy = -sum(
-        f * np.log2(f) for f in interval_freqs.values()
-    ) / np.log2(23)
+    interval_entropy = (
+        -np.sum(interval_freqs * np.log2(interval_freqs)) * _INV_LOG2_23
+    )
 
     return {
         "absolute_interval_range": absolute_interval_range,
@@ -185,12 +223,14 @@ def fantastic_step_contour_features(score: Score) -> Dict:
             - global_direction: The global direction of the step contour.
             - local_variation: The local variation of the step contour.
     """
-    notes = score.get_sorted_notes()
+    pitches, _, durations = _extract_notes(score)
+    return _step_contour_features(pitches, durations)
 
-    # Extract pitches and times for contour calculation
-    pitches = [note.pitch.midi_num for note in notes]
-    durations = [note.duration for note in notes]
 
+def _step_contour_features(
+    pitches: list[float], durations: list[float]
+) -> Dict:
+    """`fantastic_step_contour_features` of the given (sorted) notes"""
     sc = StepContour(pitches, durations)
 
     return {
@@ -221,13 +261,17 @@ def fantastic_interpolation_contour_features(score: Score) -> Dict:
             - direction_changes: The number of direction changes in the interpolation contour.
             - class_label: The class label of the interpolation contour.
     """
-    notes = score.get_sorted_notes()
+    pitches, onsets, _ = _extract_notes(score)
+    return _interpolation_contour_features(pitches, onsets)
+
 
-    # Calculate contour
+def _interpolation_contour_features(
+    pitches: list[float], onsets: list[float]
+) -> Dict:
+    """`fantastic_interpolation_contour_features` of the given (sorted)
+    notes"""
     ic = InterpolationContour(
-        pitches=[note.pitch.midi_num for note in notes],
-        onsets=[note.onset for note in notes],
-        method="fantastic",
+        pitches=pitches, onsets=onsets, method="fantastic"
     )
 
     return {
@@ -263,10 +307,16 @@ def fantastic_parsons_contour_features(
             - as_string: The Parsons contour as a string, using the characters u, r, and d
                 to represent up, repeat, and down intervals respectively.
     """
+    pitches, _, _ = _extract_notes(score)
+    return _parsons_contour_features(pitches, character_dict, initial_asterisk)
 
-    notes = score.get_sorted_notes()
 
-    pitches = [note.pitch.midi_num for note in notes]
+def _parsons_contour_features(
+    pitches: list[float],
+    character_dict: Dict = None,
+    initial_asterisk: bool = False,
+) -> Dict:
+    """`fantastic_parsons_contour_features` of the given (sorted) pitches"""
     pc = ParsonsContour(
         pitches,
         character_dict=character_dict,
@@ -297,8 +347,15 @@ def fantastic_polynomial_contour_features(score: Score) -> Dict:
         Dictionary keys:
             - coefficients: The coefficients of the polynomial contour.
     """
+    pitches, onsets, _ = _extract_notes(score)
+    return _polynomial_contour_features(pitches, onsets)
 
-    pc = PolynomialContour(score)
+
+def _polynomial_contour_features(
+    pitches: list[float], onsets: list[float]
+) -> Dict:
+    """`fantastic_polynomial_contour_features` of the given (sorted) notes"""
+    pc = PolynomialContour(onsets=onsets, pitches=pitches)
 
     return {
         "coefficients": pc.coefficients,
@@ -327,12 +384,13 @@ def fantastic_huron_contour_features(score: Score) -> Dict:
             - mean_to_last: The difference between the mean and last pitch.
             - contour_class: The class of the Huron contour.
     """
-    notes = score.get_sorted_notes()
+    pitches, onsets, _ = _extract_notes(score)
+    return _huron_contour_features(pitches, onsets)
 
-    pitches = [note.pitch.midi_num for note in notes]
-    times = [note.onset for note in notes]
 
-    hc = HuronContour(pitches, times)
+def _huron_contour_features(pitches: list[float], onsets: list[float]) -> Dict:
+    """`fantastic_huron_contour_features` of the given (sorted) notes"""
+    hc = HuronContour(pitches, onsets)
 
     return {
         "first_pitch": hc.first_pitch,
@@ -356,7 +414,8 @@ def fantastic_count_mtypes(
     score : Score
         The score to count M-Types in.
     segment : bool
-        Whether to segment the melody into phrases.
+        Whether to segment the melody into phrases. M-Types are counted
+        within each phrase.
     phrase_gap : float
         The minimum IOI gap to consider a new phrase.
     units : str
@@ -370,20 +429,21 @@ def fantastic_count_mtypes(
         by accessing the properties of the NGramCounter object or by using
         the `fantastic_mtype_summary_features` function.
     """
-    if segment:
-        segments = fantastic_segmenter(score, phrase_gap, units)
-    else:
-        segments = [score]
-
     counter = NGramCounter()
     tokenizer = FantasticTokenizer()
 
-    all_tokens = []
-    for phrase in segments:
-        tokens = tokenizer.tokenize(phrase)
-        all_tokens.extend(tokens)
+    # M-Types are counted within each phrase, so no n-gram spans a phrase
+    # boundary. Phrases shorter than 5 tokens only have the shorter n-grams.
+    if segment:
+        # phrases are tokenized as lists of notes, without building a Score
+        # for each of them
+        phrases = fantastic_segmenter_notes(score, phrase_gap, units)
+        all_tokens = [tokenizer.tokenize_notes(notes) for notes in phrases]
+    else:
+        all_tokens = [tokenizer.tokenize(score)]
 
-    counter.count_ngrams(all_tokens, n=[1, 2, 3, 4, 5])
+    for tokens in all_tokens:
+        counter.count_ngrams(tokens, n=list(range(1, min(len(tokens), 5) + 1)))
 
     return counter
 
@@ -432,3 +492,112 @@ def fantastic_mtype_summary_features(
         "sichels_s": mtype_counts.sichels_s,
         "honores_h": mtype_counts.honores_h,
     }
+
+
+def fantastic_all_features(
+    score: Score,
+    segment: bool = False,
+    phrase_gap: float = 1.0,
+    units: str = "quarters",
+) -> Dict:
+    """Extract all the implemented FANTASTIC features from a melody.
+
+    This gives the same results as calling each of the `fantastic_*`
+    feature functions, but the notes are extracted from the score only
+    once.
+
+    Parameters
+    ----------
+    score : Score
+        The score to extract features from.
+    segment : bool
+        Whether to segment the melody into phrases to count M-Types.
+    phrase_gap : float
+        The minimum IOI gap to consider a new phrase.
+    units : str
+        The units of the phrase gap, either "seconds" or "quarters".
+
+    Returns
+    -------
+    Dict
+        A dictionary of feature dictionaries, as returned by the feature
+        functions (several of them use the same keys).
+        Dictionary keys:
+            - pitch: `fantastic_pitch_features`
+            - pitch_interval: `fantastic_pitch_interval_features`
+            - step_contour: `fantastic_step_contour_features`
+            - interpolation_contour: `fantastic_interpolation_contour_features`
+            - parsons_contour: `fantastic_parsons_contour_features`
+            - polynomial_contour: `fantastic_polynomial_contour_features`
+            - huron_contour: `fantastic_huron_contour_features`
+            - mtype_summary: `fantastic_mtype_summary_features`
+    """
+    pitches, onsets, durations = _extract_notes(score)
+
+    return {
+        "pitch": _pitch_features(pitches),
+        "pitch_interval": _pitch_interval_features(pitches),
+        "step_contour": _step_contour_features(pitches, durations),
+        "interpolation_contour": _interpolation_contour_features(
+            pitches, onsets
+        ),
+        "parsons_contour": _parsons_contour_features(pitches),
+        "polynomial_contour": _polynomial_contour_features(pitches, onsets),
+        "huron_contour": _huron_contour_features(pitches, onsets),
+        "mtype_summary": fantastic_mtype_summary_features(
+            score, segment, phrase_gap, units
+        ),
+    }
+
+
+def fantastic_batch_features(
+    scores: Iterable[Score],
+    n_jobs: Optional[int] = None,
+    segment: bool = False,
+    phrase_gap: float = 1.0,
+    units: str = "quarters",
+) -> list[Dict]:
+    """Extract all the implemented FANTASTIC features from many melodies.
+
+    Melodies are independent, so `fantastic_all_features` is computed for
+    them in parallel in worker processes. The scores are pickled to be sent
+    to the workers. As with any use of multiprocessing, on platforms that
+    start workers by spawning a new interpreter (Windows, macOS), call this
+    from code guarded by `if __name__ == "__main__":`.
+
+    Parameters
+    ----------
+    scores : Iterable[Score]
+        The melodies to extract features from.
+    n_jobs : Optional[int]
+        The number of worker processes. None uses one per CPU, and 1
+        computes the features in this process, without workers.
+    segment : bool
+        Whether to segment the melodies into phrases to count M-Types.
+    phrase_gap : float
+        The minimum IOI gap to consider a new phrase.
+    units : str
+        The units of the phrase gap, either "seconds" or "quarters".
+
+    Returns
+    -------
+    list[Dict]
+        The features of each score, as returned by `fantastic_all_features`,
+        in the same order as `scores`.
+    """
+    extract = partial(
+        fantastic_all_features,
+        segment=segment,
+        phrase_gap=phrase_gap,
+        units=units,
+    )
+    scores = list(scores)
+    if n_jobs == 1 or len(scores) <= 1:
+        return [extract(score) for score in scores]
+
+    n_jobs = n_jobs or os.cpu_count() or 1
+    # send melodies in chunks, about 4 per worker, to amortize the cost of
+    # dispatching each (typically small) melody to a process
+    chunksize = max(1, len(scores) // (4 * n_jobs))
+    with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+        return list(executor.map(extract, scores, chunksize=chunksize))
@@ -1,12 +1,46 @@
+from copy import deepcopy
+from operator import attrgetter
 from typing import List
 
-from amads.core.basics import Part, Score
+import numpy as np
 
+from amads.core.basics import Note, Part, Score
 
-def fantastic_segmenter(
+
+def _phrase_bounds(onsets: np.ndarray, phrase_gap: float) -> List[int]:
+    """Find where phrases start and end in a sequence of sorted onsets.
+
+    A new phrase starts at every onset whose IOI (from the previous onset;
+    the first onset has none) is larger than `phrase_gap`.
+
+    Parameters
+    ----------
+    onsets : np.ndarray
+        Sorted onset times
+    phrase_gap : float
+        The minimum IOI gap to consider a new phrase
+
+    Returns
+    -------
+    List[int]
+        Phrase i is onsets[bounds[i]:bounds[i + 1]]. Empty if there are no
+        onsets.
+    """
+    if len(onsets) == 0:
+        return []
+    starts = np.flatnonzero(np.diff(onsets) > phrase_gap) + 1
+    return [0, *starts.tolist(), len(onsets)]
+
+
+def fantastic_segmenter_notes(
     score: Score, phrase_gap: float, units: str
-) -> List[Score]:
-    """Segment melody into phrases based on IOI gaps.
+) -> List[List[Note]]:
+    """Segment melody into phrases based on IOI gaps, as lists of notes.
+
+    This is `fantastic_segmenter` without building a Score for each phrase:
+    the phrases are slices of the (sorted) notes of `score` itself, with
+    their original onset times.
+
     Parameters
     ----------
     score : Score
@@ -18,74 +52,82 @@ def fantastic_segmenter(
 
     Returns
     -------
-    list[Score]
-        List of Score objects representing phrases
+    list[list[Note]]
+        List of phrases, each a list of the notes of `score`
     """
     assert units in ["seconds", "quarters"]
-    if units == "seconds":
+    segmenter = _segmenters.get(units)
+    if segmenter is None:
         raise NotImplementedError(
             "Seconds are not yet implemented, see issue #75: "
             "https://github.com/music-computing/amads/issues/75"
         )
-    if units == "quarters":
-        # Extract notes from score
-        notes = score.get_sorted_notes()
-
-        # Create a dictionary to store IOI information
-        ioi_data = {}
-
-        # Calculate IOIs
-        for i, note in enumerate(notes):
-            # Initialize entry for this note
-            ioi_data[note] = None
-
-            # first note has no IOI by convention
-            if i > 0:
-                ioi_data[note] = note.onset - notes[i - 1].onset
-            else:
-                ioi_data[note] = None
-
-        phrases = []
-        current_phrase = []
-        for note in notes:
-            # Check whether we need to make a new phrase
-            need_new_phrase = (
-                len(current_phrase) > 0
-                and ioi_data[note]
-                is not None  # Check current note's IOI instead of previous note
-                and ioi_data[note] > phrase_gap
+    return segmenter(score, phrase_gap)
+
+
+def _segment_notes_by_quarters(
+    score: Score, phrase_gap: float
+) -> List[List[Note]]:
+    """`fantastic_segmenter_notes` with `phrase_gap` in quarters"""
+    # Extract notes from score
+    notes = score.get_sorted_notes()
+
+    onsets = np.fromiter(
+        map(attrgetter("onset"), notes), dtype=np.float64, count=len(notes)
+    )
+    bounds = _phrase_bounds(onsets, phrase_gap)
+
+    return [notes[start:end] for start, end in zip(bounds[:-1], bounds[1:])]
+
+
+# segmenting implementation for each (implemented) unit of phrase_gap
+_segmenters = {"quarters": _segment_notes_by_quarters}
+
+
+def fantastic_segmenter(
+    score: Score, phrase_gap: float, units: str
+) -> List[Score]:
+    """Segment melody into phrases based on IOI gaps.
+    Parameters
+    ----------
+    score : Score
+        Score object containing melody to segment
+    phrase_gap : float
+        The minimum IOI gap to consider a new phrase
+    units : str
+        The units of the phrase gap, either "seconds" or "quarters"
+
+    Returns
+    -------
+    list[Score]
+        List of Score objects representing phrases
+    """
+
+    def make_phrase(phrase_notes: List[Note]) -> Score:
+        """Make a Score of the notes, shifted to start at time 0"""
+        phrase_score = Score(onset=0, duration=None)
+        part = Part(
+            parent=None, onset=0, duration=None
+        )  # parent=None is required
+        start_time = phrase_notes[0].onset
+        for phrase_note in phrase_notes:
+            # Make a new note rather than copying phrase_note, which would
+            # deep copy its attributes, including the notes it is tied to.
+            # The new note takes the whole tied duration and keeps the info
+            # properties (e.g. "rolled") set by the readers.
+            note = Note(
+                part,
+                phrase_note.onset - start_time,
+                phrase_note.duration,
+                phrase_note.pitch,
+                phrase_note.dynamic,
+                phrase_note.lyric,
             )
-            if need_new_phrase:
-                # Create new score for the phrase
-                phrase_score = Score(onset=0, duration=None)
-                part = Part(
-                    parent=None, onset=0, duration=None
-                )  # parent=None is required
-                start_time = current_phrase[0].onset
-                # Adjust note timings relative to phrase start
-                for phrase_note in current_phrase:
-                    # make a parentless copy of the note so we can adjust its onset
-                    # before inserting it into the new part in proper time order
-                    new_note = phrase_note.insert_copy_into(None)
-                    new_note.onset -= start_time
-                    part.insert(new_note)
-                phrase_score.insert(part)  # This will set the parent
-                phrases.append(phrase_score)
-                current_phrase = []
-            current_phrase.append(note)
-
-        # Append final phrase
-        if len(current_phrase) > 0:
-            phrase_score = Score(onset=0, duration=None)
-            part = Part(
-                parent=None, onset=0, duration=None
-            )  # parent=None is required
-            start_time = current_phrase[0].onset
-            for phrase_note in current_phrase:
-                new_note = phrase_note.insert_copy_into(None)
-                new_note.onset -= start_time
-                part.insert(new_note)
-            phrase_score.insert(part)  # This will set the parent
-            phrases.append(phrase_score)
-
-        return phrases
+            note.info = deepcopy(phrase_note.info)
+        phrase_score.insert(part)  # This will set the parent
+        return phrase_score
+
+    return [
+        make_phrase(phrase_notes)
+        for phrase_notes in fantastic_segmenter_notes(score, phrase_gap, units)
+    ]
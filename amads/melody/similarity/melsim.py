@@ -93,18 +93,29 @@ The following transformations are not currently functional in melsim:
 | 2 | phrase_segmentation |
 """
 
+import atexit
+import base64
+import hashlib
 import json
-import math
 import os
 import shutil
+import sqlite3
 import subprocess
-from itertools import combinations
+import tempfile
+import threading
+from contextlib import nullcontext
+from functools import lru_cache
+from operator import attrgetter
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple, Union
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple, Union
 
+import numpy as np
 from tenacity import RetryError, Retrying, stop_after_attempt, wait_exponential
 from tqdm import tqdm
 
+if TYPE_CHECKING:  # pandas is only needed for DataFrame results
+    import pandas as pd
+
 r_base_packages = ["base", "utils"]
 r_cran_packages = [
     "tibble",
@@ -123,6 +134,7 @@ r_cran_packages = [
     "ggplot2",
     "cba",
     "jsonlite",
+    "future.apply",
 ]
 r_github_packages = ["melsim"]
 github_repos = {
@@ -199,6 +211,369 @@ def _find_rscript() -> str:
     )
 
 
+# R side of MelsimWorker: load melsim once, then answer each JSON request (one
+# per line of stdin) with one framed JSON response on stdout.
+_WORKER_SCRIPT = """
+suppressMessages(suppressWarnings({
+    library(melsim)
+    library(jsonlite)
+}))
+# melodies from all requests so far, in order of arrival
+melody_list <- list()
+# doubles packed by _pack_floats
+unpack_doubles <- function(s) {
+    if (!nzchar(s)) return(numeric(0))
+    bytes <- base64_dec(s)
+    readBin(bytes, "double", n = length(bytes) %/% 8, size = 8,
+            endian = "little")
+}
+# new melodies are packed into columns; melody k is rows
+# offset[k] + 1:length[k]
+store_melodies <- function(m) {
+    pitch <- unpack_doubles(m$pitch)
+    onset <- unpack_doubles(m$onset)
+    duration <- unpack_doubles(m$duration)
+    len <- as.integer(unlist(m$length))
+    offset <- cumsum(len) - len
+    if (m$first != length(melody_list)) stop("melody cache out of sync")
+    melody_list <<- c(melody_list, lapply(seq_along(len), function(k) {
+        rows <- offset[k] + seq_len(len[k])
+        melody_factory$new(mel_data = tibble::tibble(
+            onset = onset[rows],
+            pitch = pitch[rows],
+            duration = duration[rows]
+        ))
+    }))
+}
+# stored melodies by (0-based) index
+get_melodies <- function(index) {
+    index <- as.integer(unlist(index))
+    if (any(index < 0L | index >= length(melody_list))) {
+        stop("unknown melody")
+    }
+    melody_list[index + 1L]
+}
+# similarity measures by "method|transformation", each made once
+sim_env <- new.env(hash = TRUE)
+get_sim_measure <- function(method, transformation) {
+    key <- paste(method, transformation, sep = "|")
+    if (!exists(key, envir = sim_env, inherits = FALSE)) {
+        assign(key, sim_measure_factory$new(
+            name = method,
+            full_name = method,
+            transformation = transformation,
+            parameters = list(),
+            sim_measure = method
+        ), envir = sim_env)
+    }
+    sim_env[[key]]
+}
+calc_similarity <- function(melody1, melody2, sim_measure) {
+    as.numeric(melody1$similarity(melody2, sim_measure)$sim)[1]
+}
+# number of R processes in the current future plan
+workers <- 1L
+# comparison k compares the stored melodies melody1[i] and melody2[i] with
+# method[j] and transformation[j], where i = pair[k] and j = combo[k]
+calc_similarities <- function(request) {
+    pair <- as.integer(unlist(request$pair)) + 1L
+    combo <- as.integer(unlist(request$combo)) + 1L
+    melodies1 <- get_melodies(request$melody1)[pair]
+    melodies2 <- get_melodies(request$melody2)[pair]
+    sim_measures <- mapply(
+        get_sim_measure, request$method, request$transformation,
+        SIMPLIFY = FALSE, USE.NAMES = FALSE
+    )[combo]
+    n_workers <- max(1L, as.integer(request$workers))
+    if (n_workers == 1L) {
+        sims <- mapply(
+            calc_similarity, melodies1, melodies2, sim_measures,
+            USE.NAMES = FALSE
+        )
+    } else {
+        # the worker processes persist until the plan changes. future.apply
+        # is only loaded here, so that R is ready sooner for serial use.
+        if (n_workers != workers) {
+            suppressMessages(suppressWarnings(library(future.apply)))
+            plan(multisession, workers = n_workers)
+            workers <<- n_workers
+        }
+        sims <- future_mapply(
+            calc_similarity, melodies1, melodies2, sim_measures,
+            USE.NAMES = FALSE, future.seed = TRUE, future.packages = "melsim"
+        )
+    }
+    as.numeric(sims)
+}
+# frame a response as a record separator, its length in bytes, a newline,
+# the JSON and a newline, so that any other output can be told apart
+emit <- function(x) {
+    json <- toJSON(x, auto_unbox = TRUE, digits = NA)
+    cat("\\x1e", nchar(json, type = "bytes"), "\\n", json, "\\n", sep = "")
+    flush(stdout())
+}
+con <- file("stdin", open = "r")
+emit(list(ready = TRUE))
+while (length(line <- readLines(con, n = 1)) > 0) {
+    emit(tryCatch({
+        request <- fromJSON(line)
+        store_melodies(request$melodies)
+        sims <- suppressMessages(suppressWarnings(calc_similarities(request)))
+        list(sim = I(sims))
+    }, error = function(e) list(error = conditionMessage(e))))
+}
+"""
+
+
+class MelsimWorker:
+    """A persistent R session for computing melsim similarities.
+
+    Starting R and loading melsim takes seconds, far longer than most
+    similarity calculations. Rather than running a new Rscript for every
+    calculation, the worker starts R once, and then exchanges JSON requests
+    and responses with it over stdin and stdout.
+
+    The worker is started on `__enter__` (or by `start`) and stopped on
+    `__exit__` (or by `close`); `launch` starts it without waiting for
+    melsim to load. `get_similarity`, `get_similarity_matrix` and
+    `get_similarities` share a module-level worker that is started on first
+    use (the latter two launch it before extracting melodies) and closed
+    when Python exits.
+
+    Melodies are sent to R once and cached there in a list; `melodies` maps
+    the content hash (see `_melody_key`) of each cached melody to its index
+    in the list.
+
+    Examples
+    --------
+    >>> with MelsimWorker() as worker:  # doctest: +SKIP
+    ...     response = worker.call(request)
+    """
+
+    def __init__(self):
+        self.melodies: Dict[str, int] = {}
+        self._process: Optional[subprocess.Popen] = None
+        self._ready = False  # whether R has loaded melsim
+        self._stderr = None
+        self._lock = threading.Lock()
+
+    def __enter__(self) -> "MelsimWorker":
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    @property
+    def running(self) -> bool:
+        """Whether the R process has been started and has not exited"""
+        return self._process is not None and self._process.poll() is None
+
+    def launch(self):
+        """Start the R process without waiting for it to load melsim.
+
+        Loading melsim takes seconds, so a caller can launch the worker,
+        prepare its requests in the meantime, and then `call` it, which
+        waits until R is ready.
+
+        Raises
+        ------
+        RuntimeError
+            If R cannot be found
+        """
+        global _rscript_path
+        if self.running:
+            return
+        if not _rscript_path:
+            _rscript_path = _find_rscript()
+        # R messages go to a file rather than a pipe, which could fill up
+        # and block R while nothing is reading it.
+        self._stderr = tempfile.TemporaryFile()
+        self._process = subprocess.Popen(
+            [_rscript_path, "-e", _WORKER_SCRIPT],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=self._stderr,
+        )
+        self.melodies = {}  # a new R session has no melodies
+        self._ready = False
+
+    def start(self):
+        """Start the R process (see `launch`) and wait until melsim is loaded.
+
+        Raises
+        ------
+        RuntimeError
+            If R cannot be found or exits before it is ready
+        """
+        self.launch()
+        if not self._ready:
+            self._read_response()
+            self._ready = True
+
+    def call(self, request: Dict) -> Dict:
+        """Send a request to R and return its response.
+
+        Parameters
+        ----------
+        request : Dict
+            JSON-serializable request
+
+        Returns
+        -------
+        Dict
+            The decoded response from R
+
+        Raises
+        ------
+        RuntimeError
+            If R reports an error or exits unexpectedly
+        """
+        with self._lock:
+            self.start()
+            self._process.stdin.write(json.dumps(request).encode() + b"\n")
+            self._process.stdin.flush()
+            response = self._read_response()
+        if "error" in response:
+            raise RuntimeError(f"Error in melsim: {response['error']}")
+        return response
+
+    def close(self):
+        """Stop the R process (if it is running)."""
+        if self._process is None:
+            return
+        try:
+            self._process.stdin.close()  # R exits at end of input
+            self._process.wait(timeout=5)
+        except (OSError, subprocess.TimeoutExpired):
+            self._process.kill()
+            self._process.wait()
+        self._process = None
+        self._ready = False
+        self._stderr.close()
+        self._stderr = None
+
+    def _read_response(self) -> Dict:
+        """Read one framed JSON response from R.
+
+        A response is a record separator, the length of the JSON in bytes
+        and a newline, then the JSON and a newline. Any other output (e.g.
+        printed by melsim) before the record separator is skipped.
+        """
+        stdout = self._process.stdout
+        while True:
+            line = stdout.readline()
+            if not line:
+                self._exited()
+            marker = line.rfind(b"\x1e")
+            if marker >= 0:
+                break
+        length = int(line[marker + 1 :])
+        payload = stdout.read(length + 1)  # including the final newline
+        if len(payload) <= length:
+            self._exited()
+        return json.loads(payload[:length])
+
+    def _exited(self):
+        """Close the worker after R exits, and raise its error messages"""
+        self._stderr.seek(0)
+        message = self._stderr.read().decode(errors="replace").strip()
+        self.close()
+        raise RuntimeError(f"R worker exited unexpectedly: {message}")
+
+
+# shared by the similarity functions (started on first use)
+_worker: Optional[MelsimWorker] = None
+
+
+def _get_worker() -> MelsimWorker:
+    """Return the module-level worker, creating it if needed"""
+    global _worker
+    if _worker is None:
+        _worker = MelsimWorker()
+        atexit.register(_worker.close)
+    return _worker
+
+
+def _launch_worker():
+    """Let the module-level worker load melsim while the caller continues.
+
+    If R cannot be started, the error is raised later, when similarities
+    are computed (if any need R at all).
+    """
+    try:
+        _get_worker().launch()
+    except (RuntimeError, OSError):
+        pass
+
+
+def _melody_key(pitches, starts, ends) -> str:
+    """Hash the content of a melody, to identify it in the R worker.
+
+    Parameters
+    ----------
+    pitches, starts, ends : list or numpy array
+        Melody data as returned by `score_to_arrays`
+
+    Returns
+    -------
+    str
+        Hex digest, equal for melodies with equal data
+    """
+    data = np.array([pitches, starts, ends], dtype=np.float64)
+    return hashlib.blake2b(data.tobytes(), digest_size=16).hexdigest()
+
+
+def _pack_floats(values: np.ndarray) -> str:
+    """Encode floats as base64 of their little-endian float64 bytes.
+
+    This is exact and much faster to write (and for R to read) than JSON
+    numbers, which must be converted to and from decimal text.
+    """
+    data = np.asarray(values, dtype="<f8").tobytes()
+    return base64.b64encode(data).decode("ascii")
+
+
+def _melody_columns(melodies: List[Tuple], first: int) -> Dict:
+    """Pack melodies into columns for the R worker.
+
+    Parameters
+    ----------
+    melodies : List[Tuple]
+        (pitches, start_times, end_times) of each melody, as lists or numpy
+        arrays
+    first : int
+        Index the first melody will have in the R worker's list
+
+    Returns
+    -------
+    Dict
+        "pitch", "onset" and "duration" of every note of every melody, in
+        order (see `_pack_floats`), the "length" (number of notes) of each
+        melody and "first"
+    """
+    if not melodies:
+        return {
+            "pitch": "",
+            "onset": "",
+            "duration": "",
+            "length": [],
+            "first": first,
+        }
+    # one (3, total notes) array, whose rows are contiguous float64 buffers
+    pitches, starts, ends = np.concatenate(
+        [np.asarray(m, dtype=np.float64).reshape(3, -1) for m in melodies],
+        axis=1,
+    )
+    return {
+        "pitch": _pack_floats(pitches),
+        "onset": _pack_floats(starts),
+        "duration": _pack_floats(ends - starts),
+        "length": [len(m[0]) for m in melodies],
+        "first": first,
+    }
+
+
 def check_r_packages_installed(
     install_missing: bool = False, n_retries: int = 3
 ):
@@ -461,6 +836,10 @@ VALID_TRANSFORMATIONS = [
     "implicit_harmonies",
 ]
 
+# for validation by hashed lookup (the lists above keep the order for messages)
+_VALID_METHODS_SET = frozenset(VALID_METHODS)
+_VALID_TRANSFORMATIONS_SET = frozenset(VALID_TRANSFORMATIONS)
+
 
 def validate_method(method: str):
     """Validate that the similarity method is supported.
@@ -475,7 +854,7 @@ def validate_method(method: str):
     ValueError
         If the method is not supported.
     """
-    if method not in VALID_METHODS:
+    if method not in _VALID_METHODS_SET:
         raise ValueError(
             f"Invalid method '{method}'. Valid methods are: {', '.join(VALID_METHODS)}"
         )
@@ -494,7 +873,7 @@ def validate_transformation(transformation: str):
     ValueError
         If the transformation is not supported.
     """
-    if transformation not in VALID_TRANSFORMATIONS:
+    if transformation not in _VALID_TRANSFORMATIONS_SET:
         raise ValueError(
             f"Invalid transformation '{transformation}'. Valid transformations are: {', '.join(VALID_TRANSFORMATIONS)}"
         )
@@ -551,6 +930,91 @@ def get_similarity(
     )
 
 
+def get_similarity_matrix(
+    melodies_1: List,
+    melodies_2: Optional[List] = None,
+    method: str = "Jaccard",
+    transformation: str = "pitch",
+    n_cores: int = 1,
+) -> np.ndarray:
+    """Calculate similarities of every Score in one list to every Score in another.
+
+    Unlike calling `get_similarity` for each pair, all comparisons are sent
+    to R in one request, with each distinct melody sent once. This suits,
+    e.g., comparing a few query melodies with every melody of a corpus.
+
+    Parameters
+    ----------
+    melodies_1 : List[Score]
+        Score objects containing monophonic melodies (rows of the result)
+    melodies_2 : List[Score], optional
+        Score objects containing monophonic melodies (columns of the result).
+        If omitted, melodies_1 is compared with itself.
+    method : str, default="Jaccard"
+        Name of the similarity method to use from the list in the module docstring.
+    transformation : str, default="pitch"
+        Name of the transformation to use from the list in the module docstring.
+    n_cores : int, default=1
+        Number of R processes to compute the similarities in parallel
+
+    Returns
+    -------
+    np.ndarray
+        Array of shape (len(melodies_1), len(melodies_2)) where element
+        [i, j] is the similarity of melodies_1[i] to melodies_2[j].
+
+    Examples
+    --------
+    >>> from amads.core.basics import Score
+    >>> query = Score.from_melody(pitches=[60, 62, 64, 65], durations=1.0)
+    >>> corpus = [
+    ...     Score.from_melody(pitches=[60, 62, 64, 67], durations=1.0),
+    ...     Score.from_melody(pitches=[67, 65, 64, 62], durations=1.0),
+    ... ]
+    >>> matrix = get_similarity_matrix(
+    ...     [query], corpus, "Jaccard", "pitch"
+    ... )  # doctest: +SKIP
+    >>> matrix.shape  # doctest: +SKIP
+    (1, 2)
+    """
+    validate_method(method)
+    validate_transformation(transformation)
+    _launch_worker()  # R starts up while melody data is extracted
+
+    rows = [_keyed_melody(*score_to_arrays(score)) for score in melodies_1]
+    if melodies_2 is None:
+        cols = rows
+    else:
+        cols = [_keyed_melody(*score_to_arrays(score)) for score in melodies_2]
+
+    # Each distinct comparison is computed once; for symmetric methods, the
+    # melodies of a comparison are put in a canonical order. For methods in
+    # _IDENTITY_METHODS, comparisons of melodies with the same content are
+    # numbered -1.
+    symmetric = method not in _ASYMMETRIC_METHODS
+    identity = method in _IDENTITY_METHODS
+    comparisons: Dict[Tuple[str, str], int] = {}
+    args_list = []
+    index = np.empty((len(rows), len(cols)), dtype=np.intp)
+    for i, melody1 in enumerate(rows):
+        for j, melody2 in enumerate(cols):
+            if identity and melody1[0] == melody2[0]:
+                index[i, j] = -1
+                continue
+            pair = (melody1, melody2)
+            if symmetric and melody2[0] < melody1[0]:
+                pair = (melody2, melody1)
+            key = (pair[0][0], pair[1][0])
+            if key not in comparisons:
+                comparisons[key] = len(args_list)
+                args_list.append((*pair, method, transformation))
+            index[i, j] = comparisons[key]
+
+    similarities = _batch_compute_similarities(args_list, n_cores)
+    # index -1 selects the final 1.0
+    return np.append(np.asarray(similarities, dtype=np.float64), 1.0)[index]
+
+
 def _get_similarity(
     melody1_pitches: List[float],
     melody1_starts: List[float],
@@ -577,93 +1041,67 @@ def _get_similarity(
     melody2_ends : List[float]
         End times for the second melody
     method : str
-        Name of the similarity method to use
+        Name of the similarity method to use, already validated (see
+        `get_similarity`)
     transformation : str
-        Name of the transformation to use
+        Name of the transformation to use, already validated
     Returns
     -------
     float
         Similarity value between the two melodies
     """
-    # Validate inputs
-    validate_method(method)
-    validate_transformation(transformation)
+    melody1 = _HashedMelody(melody1_pitches, melody1_starts, melody1_ends)
+    melody2 = _HashedMelody(melody2_pitches, melody2_starts, melody2_ends)
+    # symmetric methods give the same similarity in either order
+    if method not in _ASYMMETRIC_METHODS and melody2.key < melody1.key:
+        melody1, melody2 = melody2, melody1
+    return _cached_similarity(melody1, melody2, method, transformation)
 
-    # Convert arrays to comma-separated strings (works with both lists and numpy arrays)
-    pitches1_str = ",".join(map(str, melody1_pitches))
-    starts1_str = ",".join(map(str, melody1_starts))
-    ends1_str = ",".join(map(str, melody1_ends))
-    pitches2_str = ",".join(map(str, melody2_pitches))
-    starts2_str = ",".join(map(str, melody2_starts))
-    ends2_str = ",".join(map(str, melody2_ends))
-
-    # Create R script for similarity calculation
-    r_script = f"""
-    suppressMessages(suppressWarnings({{
-        library(melsim)
-        # Create melody objects
-        melody1 <- melody_factory$new(mel_data = tibble::tibble(
-            onset = c({starts1_str}),
-            pitch = c({pitches1_str}),
-            duration = c({ends1_str}) - c({starts1_str})
-        ))
-        melody2 <- melody_factory$new(mel_data = tibble::tibble(
-            onset = c({starts2_str}),
-            pitch = c({pitches2_str}),
-            duration = c({ends2_str}) - c({starts2_str})
-        ))
-        # Create similarity measure
-        sim_measure <- sim_measure_factory$new(
-            name = "{method}",
-            full_name = "{method}",
-            transformation = "{transformation}",
-            parameters = list(),
-            sim_measure = "{method}"
-        )
-        # Calculate similarity
-        result <- melody1$similarity(melody2, sim_measure)
-        cat(jsonlite::toJSON(result$sim))
-    }}))
+
+class _HashedMelody:
+    """Melody data that is hashed and compared by its content key.
+
+    This lets `_cached_similarity` look up melodies by `_melody_key`, a
+    hash of their float64 bytes, rather than by tuples of every value,
+    which are slow to build and hash for long melodies. Equal Scores
+    built separately still have equal keys.
     """
 
-    # Run R script
-    try:
-        output_str = run_script_in_r(r_script)
-        # Extract JSON from output (may contain warnings before the JSON)
-        # Find the JSON part - look for the last line or the part after newline
-        lines = output_str.split("\n")
-        json_str = lines[-1]  # JSON should be on the last line
-
-        # If that doesn't work, try to find JSON array/object markers
-        if not (
-            json_str.startswith("[")
-            or json_str.startswith("{")
-            or json_str.startswith('"')
-        ):
-            for line in reversed(lines):
-                if (
-                    line.startswith("[")
-                    or line.startswith("{")
-                    or line.startswith('"')
-                ):
-                    json_str = line
-                    break
-
-        output = json.loads(json_str)
-
-        # Handle both single values and lists
-        if isinstance(output, list):
-            value = output[0]  # Get first value if it's a list
-        else:
-            value = output
+    __slots__ = ("key", "data")
 
-        # Handle NA values from R
-        if value == "NA" or value is None:
-            return float("nan")  # Return NaN for invalid combinations
+    def __init__(self, pitches, starts, ends):
+        self.key, self.data = _keyed_melody(pitches, starts, ends)
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, _HashedMelody) and self.key == other.key
+
+    def __hash__(self) -> int:
+        return hash(self.key)
 
-        return float(value)
-    except subprocess.CalledProcessError as e:
-        raise RuntimeError(f"Error calculating similarity: {e.stderr}")
+
+@lru_cache(maxsize=1024)
+def _cached_similarity(
+    melody1: _HashedMelody,
+    melody2: _HashedMelody,
+    method: str,
+    transformation: str,
+) -> float:
+    """Memoized similarity of two melodies.
+
+    Interactive use often compares the same melodies again, e.g. while
+    trying different methods, and a repeated comparison is answered here
+    without a round trip to R.
+    """
+    return _batch_compute_similarities(
+        [
+            (
+                (melody1.key, melody1.data),
+                (melody2.key, melody2.data),
+                method,
+                transformation,
+            )
+        ]
+    )[0]
 
 
 def _convert_strings_to_tuples(d: Dict) -> Dict:
@@ -677,7 +1115,7 @@ def _convert_strings_to_tuples(d: Dict) -> Dict:
     return result
 
 
-def score_to_arrays(score) -> Tuple[List[float], List[float], List[float]]:
+def score_to_arrays(score) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
     """Extract melody attributes from a Score object.
 
     Parameters
@@ -687,155 +1125,334 @@ def score_to_arrays(score) -> Tuple[List[float], List[float], List[float]]:
 
     Returns
     -------
-    Tuple[List[int], List[float], List[float]]
-        Tuple of (pitches, start_times, end_times)
+    Tuple[np.ndarray, np.ndarray, np.ndarray]
+        Tuple of (pitches, start_times, end_times) as float arrays
+
+    Examples
+    --------
+    >>> from amads.core.basics import Score
+    >>> melody = Score.from_melody(pitches=[60, 62, 64], durations=0.5)
+    >>> pitches, starts, ends = score_to_arrays(melody)
+    >>> pitches
+    array([60., 62., 64.])
+    >>> ends - starts
+    array([0.5, 0.5, 0.5])
     """
     assert score.ismonophonic(), "Score must be monophonic"
 
     notes = score.get_sorted_notes()
+    n = len(notes)
 
     # Extract onset, pitch, duration for each note
-    pitches = [note.pitch.midi_num for note in notes]
-    starts = [note.onset for note in notes]
-    ends = [note.onset + note.duration for note in notes]
+    pitches = np.fromiter(
+        map(attrgetter("pitch.midi_num"), notes), dtype=np.float64, count=n
+    )
+    starts = np.fromiter(
+        map(attrgetter("onset"), notes), dtype=np.float64, count=n
+    )
+    durations = np.fromiter(
+        map(attrgetter("duration"), notes), dtype=np.float64, count=n
+    )
+
+    return pitches, starts, starts + durations
+
+
+# methods whose similarity can depend on the order of the melodies
+_ASYMMETRIC_METHODS = ["sim_NCD", "sim_dtw"]
+
+# symmetric methods that give similarity 1 for melodies with the same
+# (transformed) content, so such melodies need not be compared in R. Other
+# methods are always left to R: e.g. correlation is NA for a constant
+# profile, and sim_NCD of a melody with itself is below 1.
+_IDENTITY_METHODS = frozenset(
+    [
+        "Jaccard",
+        "Kulczynski2",
+        "Tanimoto",
+        "Dice",
+        "Ochiai",
+        "Simpson",
+        "edit_sim_utf8",
+        "edit_sim",
+    ]
+)
+
 
-    return pitches, starts, ends
+class _SimilarityCache:
+    """Similarities saved in an SQLite database.
 
+    Similarities are saved by the keys of the two melodies (see
+    `_melody_key`), the method and the transformation, so they can be
+    reused by later calls of `get_similarities` on the same melodies,
+    including in other sessions.
 
-def _batch_compute_similarities(args_list: List[Tuple]) -> List[float]:
+    Parameters
+    ----------
+    path : Union[str, Path]
+        Database file, created if it does not exist
+    """
+
+    def __init__(self, path: Union[str, Path]):
+        self._connection = sqlite3.connect(os.fspath(path))
+        with self._connection:
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS similarity ("
+                "melody1 TEXT, melody2 TEXT, method TEXT, transformation TEXT,"
+                " value REAL,"
+                " PRIMARY KEY (melody1, melody2, method, transformation)"
+                ") WITHOUT ROWID"
+            )
+
+    def __enter__(self) -> "_SimilarityCache":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    @staticmethod
+    def key(
+        melody1_key: str, melody2_key: str, method: str, transformation: str
+    ) -> Tuple[str, str, str, str]:
+        """Database key of a comparison (in either order if symmetric)"""
+        if method not in _ASYMMETRIC_METHODS and melody2_key < melody1_key:
+            melody1_key, melody2_key = melody2_key, melody1_key
+        return melody1_key, melody2_key, method, transformation
+
+    def get(self, key: Tuple[str, str, str, str]) -> Optional[float]:
+        """Return the saved similarity, or None if there is none"""
+        row = self._connection.execute(
+            "SELECT value FROM similarity WHERE melody1 = ? AND melody2 = ?"
+            " AND method = ? AND transformation = ?",
+            key,
+        ).fetchone()
+        if row is None:
+            return None
+        # SQLite stores NaN as NULL
+        return float("nan") if row[0] is None else row[0]
+
+    def update(self, items: List[Tuple[Tuple[str, str, str, str], float]]):
+        """Save (key, similarity) items"""
+        with self._connection:
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO similarity VALUES (?, ?, ?, ?, ?)",
+                [(*key, value) for key, value in items],
+            )
+
+    def close(self):
+        self._connection.close()
+
+
+def _keyed_melody(pitches, starts, ends) -> Tuple[str, Tuple]:
+    """Pair melody data with its key (see `_melody_key`)"""
+    return _melody_key(pitches, starts, ends), (pitches, starts, ends)
+
+
+# All similarities are computed by melsim, even for measures that look simple
+# enough to compute in Python (e.g. Jaccard of pitches): the point of this
+# module is melsim's definitions (n-grams, transformations, normalization),
+# which a reimplementation could silently diverge from. R is bypassed only
+# where the answer does not depend on those definitions: with methods in
+# _IDENTITY_METHODS, melodies that are the same, or the same after a
+# transformation (see _transformation_groups), have similarity 1, and earlier
+# results are reused (see _cached_similarity and _SimilarityCache). Time is
+# otherwise saved in how comparisons reach R (see MelsimWorker).
+def _batch_compute_similarities(
+    args_list: List[Tuple],
+    n_cores: int = 1,
+    cache: Optional[_SimilarityCache] = None,
+) -> List[float]:
     """Compute similarities for a batch of melody pairs.
 
     Parameters
     ----------
     args_list : List[Tuple]
-        List of argument tuples for _compute_similarity
+        List of (melody1, melody2, method, transformation), where the
+        melodies are made by `_keyed_melody`
+    n_cores : int, default=1
+        Number of R processes to compute the similarities in parallel
+    cache : _SimilarityCache, optional
+        If given, similarities found in the cache are not computed again,
+        and the others are saved in it
 
     Returns
     -------
     List[float]
         List of similarity values
     """
-    # Create R script for batch similarity calculation with improved efficiency
-    r_script = """
-    suppressMessages(suppressWarnings({
-        library(melsim)
-        library(jsonlite)
-        library(purrr)
-    # Function to create melody object
-    create_melody <- function(pitches, starts, ends) {
-        melody_factory$new(mel_data = tibble::tibble(
-            onset = as.numeric(strsplit(starts, ",")[[1]]),
-            pitch = as.numeric(strsplit(pitches, ",")[[1]]),
-            duration = as.numeric(strsplit(ends, ",")[[1]]) - as.numeric(strsplit(starts, ",")[[1]])
-        ))
-    }
-    # Function to calculate similarity
-    calc_similarity <- function(melody1, melody2, method, transformation) {
-        sim_measure <- sim_measure_factory$new(
-            name = method,
-            full_name = method,
-            transformation = transformation,
-            parameters = list(),
-            sim_measure = method
+    if not args_list:
+        return []
+    if cache is not None:
+        keys = [cache.key(m1[0], m2[0], m, t) for m1, m2, m, t in args_list]
+        similarities = [cache.get(key) for key in keys]
+        missing = [k for k, sim in enumerate(similarities) if sim is None]
+        computed = _batch_compute_similarities(
+            [args_list[k] for k in missing], n_cores
         )
-        result <- melody1$similarity(melody2, sim_measure)
-        result$sim
-    }
-    # Process command line arguments
-    args <- commandArgs(trailingOnly = TRUE)
-    n_args <- length(args)
-    n_comparisons <- n_args / 8  # Each comparison has 8 arguments
-    # Pre-allocate results vector
-    results <- numeric(n_comparisons)
-    # Create a cache for melody objects
-    melody_cache <- new.env()
-    # Process in chunks for better memory management
-    chunk_size <- 1000
-    n_chunks <- ceiling(n_comparisons / chunk_size)
-    for (chunk in seq_len(n_chunks)) {
-        start_idx <- (chunk - 1) * chunk_size + 1
-        end_idx <- min(chunk * chunk_size, n_comparisons)
-        # Process chunk
-        for (i in start_idx:end_idx) {
-            idx <- (i-1) * 8 + 1
-            # Get or create melody1
-            melody1_key <- paste(args[idx], args[idx+1], args[idx+2], sep="|")
-            if (!exists(melody1_key, envir=melody_cache)) {
-                melody_cache[[melody1_key]] <- create_melody(args[idx], args[idx+1], args[idx+2])
-            }
-            melody1 <- melody_cache[[melody1_key]]
-            # Get or create melody2
-            melody2_key <- paste(args[idx+3], args[idx+4], args[idx+5], sep="|")
-            if (!exists(melody2_key, envir=melody_cache)) {
-                melody_cache[[melody2_key]] <- create_melody(args[idx+3], args[idx+4], args[idx+5])
-            }
-            melody2 <- melody_cache[[melody2_key]]
-            method <- args[idx+6]
-            transformation <- args[idx+7]
-            results[i] <- calc_similarity(melody1, melody2, method, transformation)
-        }
-        # Force garbage collection after each chunk
-        gc()
+        for k, similarity in zip(missing, computed):
+            similarities[k] = similarity
+        cache.update([(keys[k], similarities[k]) for k in missing])
+        return similarities
+    worker = _get_worker()
+    worker.start()  # (re)starting R would clear its melodies
+    # send only the melodies that R does not have yet, each once, and refer
+    # to all melodies by their index in R. Each melody pair and each
+    # (method, transformation) is also sent once, and comparisons refer to
+    # them by index.
+    indices = dict(worker.melodies)
+    new_melodies = []
+    pairs: Dict[Tuple[int, int], int] = {}
+    combos: Dict[Tuple[str, str], int] = {}
+    pair_of_comparison = []
+    combo_of_comparison = []
+    for melody1, melody2, method, transformation in args_list:
+        for key, data in (melody1, melody2):
+            if key not in indices:
+                indices[key] = len(indices)
+                new_melodies.append(data)
+        pair = (indices[melody1[0]], indices[melody2[0]])
+        combo = (method, transformation)
+        pair_of_comparison.append(pairs.setdefault(pair, len(pairs)))
+        combo_of_comparison.append(combos.setdefault(combo, len(combos)))
+    request = {
+        "melodies": _melody_columns(new_melodies, len(worker.melodies)),
+        "melody1": [i for i, _ in pairs],
+        "melody2": [j for _, j in pairs],
+        "method": [m for m, _ in combos],
+        "transformation": [t for _, t in combos],
+        "pair": pair_of_comparison,
+        "combo": combo_of_comparison,
+        "workers": n_cores,
     }
-    cat(toJSON(results))
-    }))
-    """
+    try:
+        response = worker.call(request)
+    except RuntimeError:
+        worker.close()  # R may or may not have stored the new melodies
+        raise
+    worker.melodies = indices
+    # jsonlite writes NA as "NA" (and NaN as "NaN", which float() accepts)
+    return [
+        float("nan") if x == "NA" or x is None else float(x)
+        for x in response["sim"]
+    ]
 
-    # Prepare all arguments
-    all_args = []
-    for melody1_data, melody2_data, method, transformation in args_list:
-        # Convert lists to comma-separated strings
-        pitches1_str = ",".join(map(str, melody1_data[0]))
-        starts1_str = ",".join(map(str, melody1_data[1]))
-        ends1_str = ",".join(map(str, melody1_data[2]))
-        pitches2_str = ",".join(map(str, melody2_data[0]))
-        starts2_str = ",".join(map(str, melody2_data[1]))
-        ends2_str = ",".join(map(str, melody2_data[2]))
-
-        all_args.extend(
-            [
-                pitches1_str,
-                starts1_str,
-                ends1_str,
-                pitches2_str,
-                starts2_str,
-                ends2_str,
-                method,
-                transformation,
+
+# Transformations that depend only on the pitches, with functions that give
+# equal results for melodies whose transformed pitches are equal. (These may
+# be finer than melsim's: fuzzy_int classifies intervals, so equal intervals
+# give equal fuzzy intervals.)
+_PITCH_TRANSFORMATIONS = {
+    "pitch": lambda pitches: pitches,
+    "int": np.diff,
+    "fuzzy_int": np.diff,
+    "pc": lambda pitches: pitches % 12,
+    "parsons": lambda pitches: np.sign(np.diff(pitches)),
+}
+
+
+def _transformation_groups(
+    melodies: List[Tuple], transformations: List[str]
+) -> np.ndarray:
+    """Group melodies that are the same after each transformation.
+
+    Only methods in `_IDENTITY_METHODS` may treat melodies of one group as
+    having similarity 1; e.g. every transposition is in one group for the
+    int transformation, but sim_NCD or correlation of two transpositions
+    must still be computed by R.
+
+    Parameters
+    ----------
+    melodies : List[Tuple]
+        Melodies made by `_keyed_melody`
+    transformations : List[str]
+        Names of transformations
+
+    Returns
+    -------
+    np.ndarray
+        Array of shape (len(transformations), len(melodies)); melodies
+        with equal entries in row t are the same after transformation t.
+        For transformations that are not in `_PITCH_TRANSFORMATIONS` (e.g.
+        ones that depend on rhythm), only melodies with the same content
+        are grouped.
+    """
+    groups = np.empty((len(transformations), len(melodies)), dtype=np.intp)
+    for t, transformation in enumerate(transformations):
+        transform = _PITCH_TRANSFORMATIONS.get(transformation)
+        if transform is None:
+            keys = [key for key, _ in melodies]
+        else:
+            keys = [
+                hashlib.blake2b(
+                    transform(np.asarray(data[0], dtype=np.float64)).tobytes(),
+                    digest_size=16,
+                ).hexdigest()
+                for _, data in melodies
             ]
+        groups[t] = np.unique(keys, return_inverse=True)[1]
+    return groups
+
+
+def _matrix_to_dict(
+    matrix: np.ndarray, names: List[str]
+) -> Dict[str, Dict[str, float]]:
+    """Convert a square matrix to a nested dictionary {row: {col: value}}"""
+    return {
+        name: dict(zip(names, row)) for name, row in zip(names, matrix.tolist())
+    }
+
+
+def _save_similarities(
+    output_file: Union[str, Path],
+    combos: List[Tuple[str, str]],
+    sim_arrays: np.ndarray,
+    names: List[str],
+) -> Path:
+    """Save similarity matrices to a JSON or NumPy .npz file.
+
+    Parameters
+    ----------
+    output_file : Union[str, Path]
+        File to save to. If no extension is provided, .json will be added.
+    combos : List[Tuple[str, str]]
+        (method, transformation) of each matrix
+    sim_arrays : np.ndarray
+        Similarity matrices, one per combination, stacked
+    names : List[str]
+        Score name of each row (and column) of the matrices
+
+    Returns
+    -------
+    Path
+        The file saved to
+
+    Notes
+    -----
+    A JSON file holds an object mapping "<method>_<transformation>" to each
+    matrix as a nested object {row_name: {col_name: similarity}}. It is
+    written one matrix at a time. A .npz file holds the names as "names" and
+    each matrix as an array under "<method>_<transformation>".
+    """
+    output_file = Path(output_file)
+    if not output_file.suffix:
+        output_file = output_file.with_suffix(".json")
+    labels = [f"{m}_{t}" for m, t in combos]
+
+    if output_file.suffix == ".npz":
+        np.savez_compressed(
+            output_file, names=np.array(names), **dict(zip(labels, sim_arrays))
         )
+        return output_file
 
-    # Run R script with all arguments
-    try:
-        output_str = run_script_in_r(r_script)
-        # Extract JSON from output (may contain warnings before the JSON)
-        # Find the JSON part - look for the last line or the part after newline
-        lines = output_str.split("\n")
-        json_str = lines[-1]  # JSON should be on the last line
-
-        # If that doesn't work, try to find JSON array/object markers
-        if not (
-            json_str.startswith("[")
-            or json_str.startswith("{")
-            or json_str.startswith('"')
-        ):
-            for line in reversed(lines):
-                if (
-                    line.startswith("[")
-                    or line.startswith("{")
-                    or line.startswith('"')
-                ):
-                    json_str = line
-                    break
-
-        parsed_result = json.loads(json_str)
-        # Handle NA values from R
-        return [
-            float("nan") if x == "NA" or x is None else float(x)
-            for x in parsed_result
-        ]
-    except subprocess.CalledProcessError as e:
-        raise RuntimeError(f"Error calculating similarities: {e.stderr}")
+    # Same layout as json.dump(..., indent=2) of the whole mapping
+    with open(output_file, "w") as f:
+        f.write("{")
+        for i, (label, sim_array) in enumerate(zip(labels, sim_arrays)):
+            matrix = json.dumps(_matrix_to_dict(sim_array, names), indent=2)
+            matrix = matrix.replace("\n", "\n  ")  # nested one level
+            f.write(",\n  " if i else "\n  ")
+            f.write(f"{json.dumps(label)}: {matrix}")
+        f.write("\n}")
+    return output_file
 
 
 def get_similarities(
@@ -845,9 +1462,13 @@ def get_similarities(
     output_file: Union[str, Path, None] = None,
     n_cores: Optional[int] = None,
     batch_size: int = 1000,
+    cache_file: Union[str, Path, None] = None,
+    return_type: str = "dict",
 ) -> Union[
     Dict[str, Dict[str, float]],
     Dict[Tuple[str, str], Dict[str, Dict[str, float]]],
+    "pd.DataFrame",
+    Dict[Tuple[str, str], "pd.DataFrame"],
 ]:
     """Calculate pairwise similarities between multiple Score objects.
 
@@ -864,18 +1485,35 @@ def get_similarities(
         Name of the transformation(s) to use. Can be a single transformation or a list of transformations.
     output_file : Union[str, Path], optional
         If provided, save results to this file. If no extension is provided, .json will be added.
+        With a .npz extension, the matrices are saved as NumPy arrays (see
+        `_save_similarities`).
     n_cores : int, optional
         Number of CPU cores to use for parallel processing. Defaults to all available cores.
     batch_size : int, default=1000
         Number of comparisons to process in each batch
+    cache_file : Union[str, Path], optional
+        If provided, similarities are saved in this SQLite database, and
+        comparisons that it already holds (from earlier calls, with the same
+        melodies, method and transformation) are not computed again. Useful
+        for resuming interrupted runs and for repeated runs on one corpus.
+    return_type : str, default="dict"
+        Type of each similarity matrix: "dict" for nested dictionaries, or
+        "dataframe" for pandas DataFrames indexed by score name in both
+        rows and columns
 
     Returns
     -------
-    Union[Dict[str, Dict[str, float]], Dict[Tuple[str, str], Dict[str, Dict[str, float]]]]
-        If single method and transformation: nested dictionary similarity
-        matrix {row_name: {col_name: similarity}} where row_name and col_name
-        are score names. If multiple methods/transformations: dictionary mapping
-        (method, transformation) tuples to similarity matrices
+    Union[Dict[str, Dict[str, float]], Dict[Tuple[str, str], Dict[str, Dict[str, float]]], pd.DataFrame, Dict[Tuple[str, str], pd.DataFrame]]
+        If single method and transformation: similarity matrix, by default
+        a nested dictionary {row_name: {col_name: similarity}} where row_name
+        and col_name are score names. If multiple methods/transformations:
+        dictionary mapping (method, transformation) tuples to similarity
+        matrices
+
+    Raises
+    ------
+    ValueError
+        If return_type is not "dict" or "dataframe"
     """
     # Convert single method/transformation to lists
     methods = [method] if isinstance(method, str) else method
@@ -883,7 +1521,12 @@ def get_similarities(
         [transformation] if isinstance(transformation, str) else transformation
     )
 
-    # Validate all methods and transformations
+    # Validate all arguments
+    if return_type not in ("dict", "dataframe"):
+        raise ValueError(
+            f"Invalid return_type '{return_type}'. "
+            "Valid return types are: dict, dataframe"
+        )
     for m in methods:
         validate_method(m)
     for t in transformations:
@@ -892,12 +1535,14 @@ def get_similarities(
     if len(scores) < 2:
         raise ValueError("Need at least 2 Score objects for comparison")
 
+    _launch_worker()  # R starts up while melody data is extracted
+
     # Extract melody data from all scores (avoid multiprocessing due to Score object pickling issues)
     print("Extracting melody data...")
     melody_data = {}
     for name, score in tqdm(scores.items(), desc="Processing Score objects"):
         try:
-            melody_data[name] = score_to_arrays(score)
+            melody_data[name] = _keyed_melody(*score_to_arrays(score))
         except Exception as e:
             print(
                 f"Warning: Could not extract melody data for {name}: {str(e)}"
@@ -906,92 +1551,96 @@ def get_similarities(
     if len(melody_data) < 2:
         raise ValueError("Need at least 2 valid Score objects for comparison")
 
-    # Prepare arguments for parallel processing
-    print("Computing similarities...")
-    args = []
-    score_pairs = []
-
-    # Pre-compute all combinations for better performance
-    combinations_list = list(combinations(melody_data.items(), 2))
-    for (name1, data1), (name2, data2) in combinations_list:
-        for m in methods:
-            for t in transformations:
-                args.append((data1, data2, m, t))
-                score_pairs.append((name1, name2, m, t))
-
-    # Process in larger batches for better performance
-    similarities_list = []
-    for i in tqdm(range(0, len(args), batch_size), desc="Processing batches"):
-        batch = args[i : i + batch_size]
-        similarities_list.extend(_batch_compute_similarities(batch))
-
-    # Create dictionary of results
-    similarities = dict(zip(score_pairs, similarities_list))
-
-    # Convert to matrix format using native Python types
+    # Similarity matrices for all (method, transformation) combinations,
+    # stacked in one array, with 1s on the diagonal (and 0s for any scores
+    # without melody data)
     score_names = list(scores.keys())
+    combos = [(m, t) for m in methods for t in transformations]
+    n_scores = len(score_names)
+    sim_arrays = np.zeros((len(combos), n_scores, n_scores))
+    diagonal = np.arange(n_scores)
+    sim_arrays[:, diagonal, diagonal] = 1.0
+
+    # Compare each pair of melodies (i < j) with each method and
+    # transformation. Comparisons are numbered pair by pair, and only the
+    # comparisons of the current batch are built as arguments.
+    print("Computing similarities...")
+    if n_cores is None:
+        n_cores = os.cpu_count() or 1
+    name_to_index = {name: i for i, name in enumerate(score_names)}
+    positions = np.array([name_to_index[name] for name in melody_data])
+    melodies = list(melody_data.values())
+    rows, cols = np.triu_indices(len(melodies), k=1)
+    # With methods in _IDENTITY_METHODS, melodies that are the same after
+    # the transformation are as similar as a melody is to itself, so like
+    # the diagonal they get 1s, and are not compared.
+    groups = _transformation_groups(melodies, transformations)
+    combo_transformations = np.array(
+        [transformations.index(t) for _, t in combos]
+    )
+    combo_identity = np.array([m in _IDENTITY_METHODS for m, _ in combos])
+    n_comparisons = len(rows) * len(combos)
+    cache_context = (
+        _SimilarityCache(cache_file)
+        if cache_file is not None
+        else nullcontext()
+    )
+    with cache_context as cache:
+        for start in tqdm(
+            range(0, n_comparisons, batch_size), desc="Processing batches"
+        ):
+            index = np.arange(start, min(start + batch_size, n_comparisons))
+            pairs, combo_indices = np.divmod(index, len(combos))
+            batch_rows = rows[pairs]
+            batch_cols = cols[pairs]
+            t = combo_transformations[combo_indices]
+            compare = np.flatnonzero(
+                ~combo_identity[combo_indices]
+                | (groups[t, batch_rows] != groups[t, batch_cols])
+            )
+            batch = [
+                (melodies[i], melodies[j], *combos[c])
+                for i, j, c in zip(
+                    batch_rows[compare].tolist(),
+                    batch_cols[compare].tolist(),
+                    combo_indices[compare].tolist(),
+                )
+            ]
+            similarities = np.ones(len(index))
+            similarities[compare] = _batch_compute_similarities(
+                batch, n_cores, cache
+            )
+            # Set both directions to ensure perfect symmetry
+            row_positions = positions[batch_rows]
+            col_positions = positions[batch_cols]
+            sim_arrays[combo_indices, row_positions, col_positions] = (
+                similarities
+            )
+            sim_arrays[combo_indices, col_positions, row_positions] = (
+                similarities
+            )
 
-    # Create similarity matrices as nested dictionaries
-    matrices = {}
+    if return_type == "dataframe":
+        import pandas as pd
 
-    for m in methods:
-        for t in transformations:
-            # Initialize matrix as nested dictionary with 1s on diagonal
-            sim_matrix = {}
-            for name1 in score_names:
-                sim_matrix[name1] = {}
-                for name2 in score_names:
-                    if name1 == name2:
-                        sim_matrix[name1][name2] = 1.0
-                    else:
-                        sim_matrix[name1][name2] = 0.0
-
-            # Fill matrix with pairwise similarities
-            # Since combinations() only gives us each pair once, set both directions
-            for (
-                name1,
-                name2,
-                method_key,
-                transformation_key,
-            ), similarity in similarities.items():
-                if method_key == m and transformation_key == t:
-                    # Handle NaN values consistently
-                    if (
-                        similarity == "NA"
-                        or similarity is None
-                        or (
-                            isinstance(similarity, float)
-                            and math.isnan(similarity)
-                        )
-                    ):
-                        sim_value = float("nan")
-                    else:
-                        sim_value = float(similarity)
-
-                    # Set both directions to ensure perfect symmetry
-                    sim_matrix[name1][name2] = sim_value
-                    sim_matrix[name2][name1] = sim_value
-
-            matrices[(m, t)] = sim_matrix
+        matrices = {
+            combo: pd.DataFrame(
+                sim_array, index=score_names, columns=score_names
+            )
+            for combo, sim_array in zip(combos, sim_arrays)
+        }
+    else:
+        matrices = {
+            combo: _matrix_to_dict(sim_array, score_names)
+            for combo, sim_array in zip(combos, sim_arrays)
+        }
 
     # Save to file if output file specified
     if output_file:
         print("Saving results...")
-
-        # Ensure output file has .json extension
-        output_file = Path(output_file)
-        if not output_file.suffix:
-            output_file = output_file.with_suffix(".json")
-
-        # Save matrices to JSON
-        output_data = {}
-        for (m, t), matrix in matrices.items():
-            output_data[f"{m}_{t}"] = matrix
-
-        import json
-
-        with open(output_file, "w") as f:
-            json.dump(output_data, f, indent=2)
+        output_file = _save_similarities(
+            output_file, combos, sim_arrays, score_names
+        )
         print(f"Results saved to {output_file}")
 
     # Return format depends on number of method/transformation combinations
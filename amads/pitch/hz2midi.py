@@ -6,6 +6,8 @@ Original doc: MIDI Tooolbox (https://github.com/miditoolbox/1.1/blob/master/docu
 
 import math
 
+import numpy as np
+
 
 def hz2midi(hertz):
     """
@@ -45,9 +47,11 @@ def hz2midi(hertz):
             )
 
     if isinstance(hertz, list):
-        for hz in hertz:
-            validate_hz(hz)
-        return [69 + 12 * math.log2(hz / 440.0) for hz in hertz]
+        hz = np.asarray(hertz, dtype=np.float64)
+        negative = np.flatnonzero(hz < 0)
+        if len(negative) > 0:
+            validate_hz(hertz[negative[0]])
+        return (69 + 12 * np.log2(hz / 440.0)).tolist()
     else:
         validate_hz(hertz)
         return 69 + 12 * math.log2(hertz / 440.0)
@@ -7,6 +7,8 @@ Can emulate the `ivdurdist1` function in Midi Toolbox.
 Original doc: https://github.com/miditoolbox/1.1/blob/master/documentation/MIDItoolbox1.1_manual.pdf, page 65.
 """
 
+import numpy as np
+
 from amads.core.basics import Score
 from amads.core.distribution import Distribution
 from amads.pitch.ivdist1 import interval_distribution_1
@@ -56,21 +58,16 @@ def interval_direction_distribution_1(
     """
 
     id = interval_distribution_1(score, name, weighted, miditoolbox_compatible)
-    id = id.data  # we only need the data from the distribution
-    idd = [0.0] * 12
-
-    for i in range(12):
-        # id[i + 13] is the upward interval
-        # id[11 - i] is the downward interval
-        if (id[i + 13] + id[11 - i]) != 0:
-            idd[i] = id[i + 13] / (id[i + 13] + id[11 - i])
-        else:
-            idd[i] = 0
+    id = np.asarray(id.data)  # we only need the data from the distribution
+    up = id[13:25]  # upward intervals, from a minor second to an octave
+    down = id[11::-1]  # the corresponding downward intervals
+    total = up + down
+    idd = np.divide(up, total, out=np.zeros(12), where=total != 0)
 
     x_categories = [str(i) for i in range(1, 13)]
     return Distribution(
         name,
-        idd,
+        idd.tolist(),
         "interval_direction",
         [12],
         x_categories,  # type: ignore
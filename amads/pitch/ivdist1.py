@@ -6,12 +6,62 @@ Implements the Midi Toolbox `ivdist1` function
 Original doc: https://github.com/miditoolbox/1.1/blob/master/documentation/MIDItoolbox1.1_manual.pdf, page 64.
 """
 
-from typing import cast
+from typing import List, Optional, Tuple, cast
+
+import numpy as np
 
 from amads.core.basics import Note, Part, Score
 from amads.core.distribution import Distribution
-from amads.core.histogram import Histogram1D
-from amads.pitch.pcdist1 import duraccent
+from amads.pitch.pcdist1 import _duration_accent
+
+
+def _note_arrays(
+    score: Score, weighted: bool
+) -> List[Tuple[np.ndarray, Optional[np.ndarray]]]:
+    """Extract the notes of each part of a score as arrays.
+
+    Tied notes are merged, as in all of the interval distributions, which
+    share this so that each walks the score once.
+
+    Parameters
+    ----------
+    score : Score
+        The musical score (which is not modified)
+    weighted : bool
+        If True, also compute the durational accents of the notes
+
+    Returns
+    -------
+    List[Tuple[np.ndarray, Optional[np.ndarray]]]
+        For each part, the MIDI key numbers of its notes and, if weighted,
+        their durational accents (see `duraccent`), else None
+    """
+    # Copying the score to merge ties is only needed if there are ties
+    if score.has_ties():
+        score = cast(Score, score.merge_tied_notes())
+    arrays = []
+    for p in score.find_all(Part):
+        part: Part = cast(Part, p)
+        notes = cast(List[Note], part.list_all(Note))
+        pitches = np.fromiter(
+            (note.midi_num for note in notes),
+            dtype=np.float64,
+            count=len(notes),
+        )
+        accents = None
+        if weighted:  # durational accents need durations in seconds
+            if score.units_are_seconds:
+                durs = (note.duration for note in notes)
+            else:  # convert durations rather than (a copy of) the score
+                to_time = score.time_map.quarter_to_time
+                durs = (
+                    to_time(note.offset) - to_time(note.onset) for note in notes
+                )
+            accents = np.fromiter(
+                map(_duration_accent, durs), dtype=np.float64, count=len(notes)
+            )
+        arrays.append((pitches, accents))
+    return arrays
 
 
 def interval_distribution_1(
@@ -61,48 +111,34 @@ def interval_distribution_1(
     if not score.ismonophonic():
         raise ValueError("Error: Score must be monophonic")
 
-    score = cast(Score, score.merge_tied_notes())
-    if weighted:
-        score.convert_to_seconds()
-
     bin_centers = [float(i - 12) for i in range(25)]  # 25 bins from -12 to +12
-    bin_boundaries = [i - 12 - 0.5 for i in range(26)]  # boundaries
     x_categories = [str(c) for c in bin_centers]
-    h = Histogram1D(bin_centers, bin_boundaries, "linear", True)
-
-    for p in score.find_all(Part):
-        part: Part = cast(Part, p)
-        prev_pitch = None
-        prev_dur = None
-        for n in part.find_all(Note):
-            note: Note = cast(Note, n)
-            if prev_pitch is not None:
-                iv = round(note.midi_num - prev_pitch)
-                if miditoolbox_compatible:
-                    iv = (abs(iv) % 12) * ((iv > 0) - (iv < 0))
-                # otherwise, diff may be ignored by h.add_point
-                if weighted:
-                    dur = duraccent(note)
-                    # prev_dur cannot be None here since prev_pitch is not None
-                    h.add_point(iv, prev_dur + dur)  # type: ignore
-                    prev_dur = dur
-                else:
-                    h.add_point(iv, 1.0)
-            prev_pitch = note.midi_num
-            if weighted and prev_dur is None:
-                prev_dur = duraccent(note)
+    bins = np.zeros(25)
+
+    for pitches, accents in _note_arrays(score, weighted):
+        iv = np.rint(np.diff(pitches)).astype(np.int64)
+        if miditoolbox_compatible:
+            iv = (np.abs(iv) % 12) * np.sign(iv)
+        if accents is not None:
+            weights = accents[:-1] + accents[1:]
+        else:
+            weights = np.ones(len(iv))
+        # intervals greater than an octave are ignored
+        in_range = np.abs(iv) <= 12
+        np.add.at(bins, iv[in_range] + 12, weights[in_range])
 
     if miditoolbox_compatible:  # miditoolbox "normalization"
-        total = sum(h.bins) + len(h.bins) * 1e-12
-        h.bins = [b / total for b in h.bins]
+        bins /= bins.sum() + len(bins) * 1e-12
     else:  # normalize normally
-        h.normalize()
+        total = bins.sum()
+        if total > 0:
+            bins /= total
 
     return Distribution(
         name,
-        h.bins,
+        bins.tolist(),
         "interval",
-        [len(h.bins)],
+        [len(bins)],
         x_categories,  # type: ignore
         "Interval (semitones)",
         None,
@@ -6,12 +6,56 @@ Implements the Midi Toolbox `ivdist2` function
 Original doc: https://github.com/miditoolbox/1.1/blob/master/documentation/MIDItoolbox1.1_manual.pdf, page 65.
 """
 
-from typing import cast
+from typing import Optional
 
-from amads.core.basics import Note, Part, Score
+import numpy as np
+
+from amads.core.basics import Score
 from amads.core.distribution import Distribution
-from amads.core.histogram import Histogram2D
-from amads.pitch.pcdist1 import duraccent
+from amads.pitch.ivdist1 import _note_arrays
+
+
+def _update_id(
+    id: np.ndarray,
+    pitches: np.ndarray,
+    durs: Optional[np.ndarray],
+    miditoolbox_compatible: bool,
+) -> None:
+    """Add the interval transitions of one part to a 25x25 matrix.
+
+    Parameters
+    ----------
+    id : np.ndarray
+        The 25x25 matrix of (weighted) transition counts, updated in place.
+        Row and column i count intervals of i - 12 semitones.
+    pitches : np.ndarray
+        The MIDI key numbers of the notes of the part, in order
+    durs : Optional[np.ndarray]
+        The durational accents of the notes, or None for unweighted counts
+    miditoolbox_compatible : bool
+        See `interval_distribution_2`
+    """
+    iv = np.rint(np.diff(pitches)).astype(np.int64)
+    if miditoolbox_compatible:
+        iv = (np.abs(iv) % 12) * np.sign(iv)
+        # a unison is inserted before the first interval
+        prev_iv = np.concatenate(([0], iv))[:-1]
+        if durs is not None:  # the two notes of the second interval
+            weights = durs[:-1] + durs[1:]
+    else:
+        prev_iv = iv[:-1]
+        iv = iv[1:]
+        if durs is not None:  # all three notes
+            weights = durs[:-2] + durs[1:-1] + durs[2:]
+    if durs is None:
+        weights = np.ones(len(iv))
+    # transitions to or from intervals greater than an octave are ignored
+    in_range = (np.abs(prev_iv) <= 12) & (np.abs(iv) <= 12)
+    np.add.at(
+        id,
+        (prev_iv[in_range] + 12, iv[in_range] + 12),
+        weights[in_range],
+    )
 
 
 def interval_distribution_2(
@@ -67,54 +111,22 @@ def interval_distribution_2(
     if not score.ismonophonic():
         raise ValueError("Error: Score must be monophonic")
 
-    score = cast(Score, score.merge_tied_notes())
-    if weighted:
-        score.convert_to_seconds()  # need seconds for duraccent function
-
     bin_centers = [float(i - 12) for i in range(25)]  # 25 bins from -12 to +12
-    bin_boundaries = [i - 12 - 0.5 for i in range(26)]  # boundaries
     x_categories = [str(c) for c in bin_centers]
     y_categories = x_categories
-    h = Histogram2D(bin_centers, bin_boundaries, "linear", True)
-    for p in score.find_all(Part):
-        part: Part = cast(Part, p)
-        dur = 0.0  # (this value is never used)
-        prev_iv = 0 if miditoolbox_compatible else None  # previous interval
-        prev_pitch = None
-        prev_dur = 0
-        prev_prev_dur = 0
-        prev_bin = None
-        for n in part.find_all(Note):
-            note: Note = cast(Note, n)
-            if weighted:
-                dur = duraccent(note)
-            if prev_pitch is not None:
-                iv = round(note.midi_num - prev_pitch)
-                if miditoolbox_compatible:
-                    iv = (abs(iv) % 12) * ((iv > 0) - (iv < 0))
-                if weighted:
-                    dur = duraccent(note)
-                    w = prev_dur + dur
-                    if not miditoolbox_compatible:
-                        w += prev_prev_dur
-                    prev_bin = h.add_point_2d(prev_iv, iv, w, prev_bin)
-                    prev_prev_dur = prev_dur
-                else:
-                    prev_bin = h.add_point_2d(prev_iv, iv, 1.0, prev_bin)
-                prev_iv = None if prev_bin is None else iv
-            prev_pitch = note.midi_num
-            prev_dur = dur
-    if miditoolbox_compatible:
-        total = sum(sum(bin) for bin in h.bins) + (
-            len(h.bins) * len(h.bins) * 1e-12
-        )
-        h.bins = [[c / total for c in row] for row in h.bins]
+    id = np.zeros((25, 25))
+    for pitches, accents in _note_arrays(score, weighted):
+        _update_id(id, pitches, accents, miditoolbox_compatible)
+    if miditoolbox_compatible:  # miditoolbox "normalization"
+        id /= id.sum() + id.size * 1e-12
     else:  # normalize normally
-        h.normalize()
+        total = id.sum()
+        if total > 0:
+            id /= total
 
     return Distribution(
         name,
-        h.bins,
+        id.tolist(),
         "interval_transition",
         [25, 25],
         x_categories,  # type: ignore
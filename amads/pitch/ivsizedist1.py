@@ -2,10 +2,17 @@
 Provides the `ivsizedist1` function
 """
 
+import numpy as np
+
 from amads.core.basics import Score
 from amads.core.distribution import Distribution
 from amads.pitch.ivdist1 import interval_distribution_1
 
+# categories (interval sizes 0 to 12) and dimensions of every result,
+# shared like CHROMATIC_NAMES is by pitch_class_distribution_1
+_ISD_CATEGORIES = [str(i) for i in range(13)]
+_ISD_DIMENSIONS = [13]
+
 
 def interval_size_distribution_1(
     score: Score,
@@ -46,20 +53,20 @@ def interval_size_distribution_1(
         the function returns a Distribution with all elements set to zero.
     """
     id = interval_distribution_1(score, name, weighted, miditoolbox_compatible)
-    id = id.data  # we only need the data from the distribution
-    isd = [0.0] * 13
+    # we only need the data from the distribution
+    id_arr = np.asarray(id.data, dtype=np.float64)
+    isd = np.empty(13)
 
-    isd[0] = id[12]
-    for i in range(1, 13):
-        isd[i] = id[i + 12] + id[12 - i]  # merge upward and downward bins
-    # note that isd is normalized because it sums to the same value as isd
-    x_categories = [str(i) for i in range(13)]
+    isd[0] = id_arr[12]
+    # merge upward (13 to 24) and downward (11 down to 0) bins
+    isd[1:] = id_arr[13:25] + id_arr[11::-1]
+    # note that isd is normalized because it sums to the same value as id
     return Distribution(
         name,
-        isd,
+        isd.tolist(),
         "interval_size",
-        [13],
-        x_categories,  # type: ignore
+        _ISD_DIMENSIONS,
+        _ISD_CATEGORIES,  # type: ignore
         "Interval Size",
         None,
         "Proportion",
@@ -12,7 +12,6 @@ https://github.com/miditoolbox/1.1/blob/master/documentation/MIDItoolbox1.1_manu
 
 __author__ = ["Tai Nakamura", "Di Wang"]
 
-import math
 from dataclasses import fields
 from typing import List, Optional, Tuple
 
@@ -20,7 +19,15 @@ import numpy as np
 
 import amads.pitch.key.profiles as prof
 from amads.core.basics import Score
-from amads.pitch.pcdist1 import pitch_class_distribution_1
+from amads.pitch.pcdist1 import _pcd_array
+
+# Salience weights. NOTE: this is not the weight vector,
+# the salience weights for the c-pitch in the pitch-class distribution
+# is [1, 0, 0.2, 0.17, 0.33, 0, 0, 0.5, 0, 0, 0.25, 0].
+# These weights form the first column of the 12x12 matrix _SALM, which
+# is the same for every score, so it is built once here.
+_SAL2 = np.array([1, 0, 0.25, 0, 0, 0.5, 0, 0, 0.33, 0.17, 0.2, 0] * 2)
+_SALM = np.stack([_SAL2[12 - i : 24 - i] for i in range(12)])
 
 
 def key_cc(
@@ -28,6 +35,7 @@ def key_cc(
     profile: prof.KeyProfile = prof.krumhansl_kessler,
     attribute_names: Optional[List[str]] = None,
     salience_flag: bool = False,
+    only_index: Optional[int] = None,
 ) -> List[Tuple[str, Optional[Tuple[float]]]]:
     """
     Calculate the correlation coefficients with specific pitch profiles.
@@ -75,13 +83,19 @@ def key_cc(
         If True, apply salience pitch-wise bias weights to the score's
         pitch-class distribution.
 
+    only_index: Optional[int]
+        If given, compute only the correlation with the profile for this
+        chromatic degree (e.g. 0 for C), rather than all 12. Used by
+        keymode, which only needs the correlations for C.
+
     Returns
     -------
     List[Tuple[str, Optional[Tuple[float]]]]
         A list of tuples where each tuple contains the attribute name, from
         parameter `attribute_names`, and the corresponding 12-tuple of
-        correlation coefficients. If an attribute name does not reference
-        a valid data field within the specified key profile, it will yield
+        correlation coefficients (a 1-tuple if `only_index` is given). If
+        an attribute name does not reference a valid data field within
+        the specified key profile, it will yield
         `(`*attribute_name*`, None)`.
 
     Raises
@@ -92,21 +106,15 @@ def key_cc(
     """
 
     # Get pitch-class distribution
-    pcd = np.array([pitch_class_distribution_1(score, weighted=False).data])
+    pcd = _pcd_array(score, weighted=False)
 
     # Apply salience weighting if requested
     if salience_flag:
-        # NOTE: this is not the weight vector,
-        # the salience weights for the c-pitch in the pitch-class distribution
-        # is [1, 0, 0.2, 0.17, 0.33, 0, 0, 0.5, 0, 0, 0.25, 0].
-        # These weights form the first column of the 12x12 matrix salm.
-        sal2 = [1, 0, 0.25, 0, 0, 0.5, 0, 0, 0.33, 0.17, 0.2, 0] * 2
-        salm = np.zeros((12, 12))
-        for i in range(salm.shape[0]):
-            salm[i] = sal2[12 - i : 24 - i]
-        pcd = np.matmul(pcd, salm.T)  # shape (1, 12)
+        pcd = np.matmul(pcd, _SALM.T)
 
     results = []
+    # (index into results, profile matrix) for each valid attribute
+    valid = []
 
     true_attribute_names = attribute_names
 
@@ -134,23 +142,49 @@ def key_cc(
             )
             results.append((attr_name, None))
             continue
-        profiles_matrix = attr_value.as_canonical_matrix()
-        correlations = tuple(_compute_correlations(pcd, profiles_matrix))
-        if any(math.isnan(val) for val in correlations):
-            raise RuntimeError(
-                "key_cc has encountered either an invalid or equal weight"
-                " score, or invalid pitch profile\n"
-                f"correlations = {list(correlations)}\n"
-                f"score pitch-class distribution = {list(pcd)}\n"
-                f"profiles matrix = \n{profiles_matrix}\n"
-            )
-        results.append((attr_name, correlations))
+        # correlations are filled in below, for all profiles at once
+        results.append((attr_name, None))
+        centered, inv_norms = attr_value._centered_canonical_matrix
+        if only_index is not None:
+            centered = centered[only_index : only_index + 1]
+            inv_norms = inv_norms[only_index : only_index + 1]
+        valid.append((len(results) - 1, attr_value, centered, inv_norms))
+
+    if not valid:
+        return results
+
+    # one correlation computation over all of the profile matrices stacked
+    split_points = np.cumsum([len(centered) for (_, _, centered, _) in valid])
+    all_correlations = _compute_correlations(
+        pcd,
+        np.vstack([centered for (_, _, centered, _) in valid]),
+        np.concatenate([inv_norms for (_, _, _, inv_norms) in valid]),
+    )
+    per_attribute = np.split(all_correlations, split_points[:-1])
+    # NaN only comes from a zero denominator (equal weights in the pcd or
+    # in a profile), so one check covers all of the correlations
+    if np.isnan(all_correlations).any():
+        # report the first profile whose correlations are undefined
+        attr_value, correlations = next(
+            (attr_value, correlations)
+            for (_, attr_value, _, _), correlations in zip(valid, per_attribute)
+            if np.isnan(correlations).any()
+        )
+        raise RuntimeError(
+            "key_cc has encountered either an invalid or equal weight"
+            " score, or invalid pitch profile\n"
+            f"correlations = {correlations.tolist()}\n"
+            f"score pitch-class distribution = {pcd.tolist()}\n"
+            f"profiles matrix = \n{attr_value.as_canonical_matrix()}\n"
+        )
+    for (i, _, _, _), correlations in zip(valid, per_attribute):
+        results[i] = (results[i][0], tuple(correlations))
 
     return results
 
 
 def _compute_correlations(
-    pcd: np.ndarray, profile_matrix: np.ndarray
+    pcd: np.ndarray, centered: np.ndarray, inv_norms: np.ndarray
 ) -> np.ndarray:
     """
     Compute correlations between pitch-class distribution and profile matrix.
@@ -158,22 +192,28 @@ def _compute_correlations(
     Parameters
     ----------
     pcd : np.ndarray
-        Pitch-class distribution (1x12)
-    profile_matrix : np.ndarray
-        Profile matrix (Nx12 where N is number of keys/profiles)
+        Pitch-class distribution (12 elements)
+    centered : np.ndarray
+        Profile matrix (Nx12 where N is number of keys/profiles) with the
+        mean of each row subtracted
+    inv_norms : np.ndarray
+        Reciprocals of the norms of the rows of `centered` (N elements)
 
     Returns
     -------
     np.ndarray
-        Correlation coefficients
+        Correlation coefficients (NaN where either the pcd or a profile
+        has equal weights)
     """
-    # Combine pcd and profile matrix for correlation computation
-    combined_matrix = np.concatenate(
-        (pcd, profile_matrix), axis=0
-    )  # shape (25, 12)
-    correlation_matrix = np.corrcoef(combined_matrix)
-
-    # Extract correlations between pcd (first row) and all profiles
-    correlations = correlation_matrix[0, 1:]
-
-    return correlations
+    # Pearson correlation of the pcd with each row of the profile matrix,
+    # rather than the full (N+1)x(N+1) matrix from np.corrcoef. The
+    # profile's share of the work is precomputed by PitchProfile.
+    x = pcd - pcd.mean()
+    # Sums are taken over sorted terms so that they do not depend on the
+    # order of the pitch classes: profiles that are rearrangements of each
+    # other (e.g. Temperley's major and minor) then give exactly equal
+    # correlations when they match equally well, as keymode relies on.
+    products = centered * x
+    products.sort(axis=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return products.sum(axis=1) * inv_norms / np.sqrt(x @ x)
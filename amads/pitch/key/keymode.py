@@ -12,6 +12,8 @@ https://github.com/miditoolbox/1.1/blob/master/documentation/MIDItoolbox1.1_manu
 
 from typing import List, Optional
 
+import numpy as np
+
 import amads.pitch.key.profiles as prof
 from amads.core.basics import Score
 from amads.pitch.key.key_cc import key_cc
@@ -56,20 +58,16 @@ def keymode(
     key_cc
     """
 
-    # This algorithm is not very efficient: It computes 12 correlations
-    # for each mode, but only uses one. Then, it iterates through the
-    # results, once to find the maximum, and again to form a list of
-    # modes that achieve that maximum.
-
-    corrcoef_pairs = key_cc(score, profile, attribute_names, salience_flag)
-
-    c_max_val_iter = (
-        coefs[0] for (_, coefs) in corrcoef_pairs if coefs is not None
+    # Only the correlation with each mode's C profile is needed.
+    corrcoef_pairs = key_cc(
+        score, profile, attribute_names, salience_flag, only_index=0
     )
-    c_max_val = max(c_max_val_iter)
-    keymode_attributes = [
-        attr
+
+    c_pairs = [
+        (attr, coefs[0])
         for (attr, coefs) in corrcoef_pairs
-        if coefs is not None and coefs[0] == c_max_val
+        if coefs is not None
     ]
-    return keymode_attributes
+    c_vals = np.array([c for (_, c) in c_pairs])
+    # all modes that achieve the maximum (exactly equal correlations)
+    return [c_pairs[i][0] for i in np.flatnonzero(c_vals == c_vals.max())]
@@ -157,6 +157,7 @@ Gotham et al. "What if the 'When' Implies the 'What'?". ISMIR, 2021
 """
 
 from dataclasses import dataclass
+from functools import cached_property
 from typing import List, Tuple, Union
 
 import numpy as np
@@ -301,6 +302,9 @@ class PitchProfile(Distribution):
         For each key, the sum of all weights in the corresponding key profile
         is normalized to 1.
         """
+        # the data changes, so the cached canonical matrices are stale
+        self.__dict__.pop("_canonical_matrix", None)
+        self.__dict__.pop("_centered_canonical_matrix", None)
         if self.distribution_type == "symmetric_key_profile":
             self.data = norm.normalize(self.data, "sum").tolist()
             return self
@@ -359,6 +363,13 @@ class PitchProfile(Distribution):
         np.ndarray
             a 12x12 numpy matrix of floats
         """
+        # the matrix is built once per profile; return a copy so that
+        # callers cannot modify the cached one
+        return self._canonical_matrix.copy()
+
+    @cached_property
+    def _canonical_matrix(self) -> np.ndarray:
+        """The result of `as_canonical_matrix`, computed when first needed"""
         assert self.dimensions[0] == 12
         if self.distribution_type == "symmetric_key_profile":
             # in this case, symmetric profile is transpositionally equivalent,
@@ -374,6 +385,25 @@ class PitchProfile(Distribution):
             assert self.dimensions == [12, 12]
             return np.array(self.data)
 
+    @cached_property
+    def _centered_canonical_matrix(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        The canonical matrix with each row's mean subtracted, and the
+        reciprocal of each centered row's norm.
+
+        These are the parts of a Pearson correlation with each row that
+        depend only on the profile (see `amads.pitch.key.key_cc`). The
+        squares are summed in sorted order so that rows that are
+        rearrangements of each other get exactly equal norms.
+        """
+        matrix = self._canonical_matrix
+        centered = matrix - matrix.mean(axis=1, keepdims=True)
+        squares = centered * centered
+        squares.sort(axis=1)
+        with np.errstate(divide="ignore"):  # inf for equal weights
+            inv_norms = 1 / np.sqrt(squares.sum(axis=1))
+        return centered, inv_norms
+
     # def profile_plot(
     #     self,
     #     color: str = Distribution.DEFAULT_BAR_COLOR,
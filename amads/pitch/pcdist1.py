@@ -7,11 +7,13 @@ Original doc: https://github.com/miditoolbox/1.1/blob/master/documentation/MIDIt
 """
 
 import math
-from typing import cast
+from functools import lru_cache
+from typing import List, cast
+
+import numpy as np
 
 from amads.core.basics import Note, Score
 from amads.core.distribution import Distribution
-from amads.core.histogram import Histogram1D
 from amads.core.pitch import CHROMATIC_NAMES
 
 
@@ -37,8 +39,16 @@ def duraccent(note: Note) -> float:
     float
         The durational accent value.
     """
-    accent = 1 - math.exp(-note.duration / 0.5) ** 2
-    return accent
+    return _duration_accent(note.duration)
+
+
+@lru_cache(maxsize=1024)
+def _duration_accent(duration: float) -> float:
+    """Durational accent of a duration (in seconds); see `duraccent`.
+
+    Memoized because quantized scores have few distinct durations.
+    """
+    return 1 - math.exp(-duration / 0.5) ** 2
 
 
 def pitch_class_distribution_1(
@@ -76,30 +86,12 @@ def pitch_class_distribution_1(
         pitch class (C, C#, D, D#, E, F, F#, G, G#, A, A#, B). If the score
         is empty, the function returns a list with all elements set to zero.
     """
-    score = cast(Score, score.merge_tied_notes())
-    if weighted:
-        score.convert_to_seconds()  # need seconds for duraccent calculation
-    initial_value = 1e-12 if miditoolbox_compatible else 0.0
-    bin_centers = [float(i) for i in range(12)]  # 25 bins from -12 to +12
+    bins = _pcd_array(score, weighted, miditoolbox_compatible)
     xcategories = CHROMATIC_NAMES
-    h = Histogram1D(bin_centers, None, "linear", False, initial_value)
-
-    for note in score.find_all(Note):
-        note = cast(Note, note)
-        h.add_point(
-            round(note.pitch_class) % 12, duraccent(note) if weighted else 1.0
-        )
-
-    if miditoolbox_compatible:  # miditoolbox "normalization"
-        total = sum(h.bins) + len(h.bins) * 1e-12
-        h.bins = [b / total for b in h.bins]
-    else:  # normalize normally
-        h.normalize()
-
     # xcategories is List[str], but Distribution takes int | float | str
     return Distribution(
         name,
-        h.bins,
+        bins.tolist(),
         "pitch_class",
         [12],
         xcategories,  # type: ignore
@@ -107,3 +99,38 @@ def pitch_class_distribution_1(
         None,
         "Proportion",
     )
+
+
+def _pcd_array(
+    score: Score, weighted: bool = True, miditoolbox_compatible: bool = False
+) -> np.ndarray:
+    """The data of `pitch_class_distribution_1` as a 12-element array.
+
+    For callers that only need the numbers, such as `key_cc`.
+    """
+    score = cast(Score, score.merge_tied_notes())
+    if weighted:
+        score.convert_to_seconds()  # need seconds for duraccent calculation
+    initial_value = 1e-12 if miditoolbox_compatible else 0.0
+    bins = np.full(12, initial_value)
+
+    # pitch classes index the bins directly
+    notes = cast(List[Note], score.list_all(Note))
+    pcs = np.fromiter(
+        (note.pitch_class for note in notes), dtype=np.float64, count=len(notes)
+    )
+    if weighted:
+        weights = np.fromiter(
+            map(duraccent, notes), dtype=np.float64, count=len(notes)
+        )
+    else:
+        weights = np.ones(len(notes))
+    np.add.at(bins, np.rint(pcs).astype(np.int64) % 12, weights)
+
+    if miditoolbox_compatible:  # miditoolbox "normalization"
+        bins /= bins.sum() + len(bins) * 1e-12
+    else:  # normalize normally
+        total = bins.sum()
+        if total > 0:
+            bins /= total
+    return bins
@@ -15,6 +15,7 @@ Original Document: https://github.com/miditoolbox/1.1/blob/master/documentation/
 
 __author__ = "Arnav Sayooj"
 
+from operator import attrgetter
 
 from amads.core.basics import Note, Score
 
@@ -66,7 +67,7 @@ def extreme(score: Score, method: str = "high") -> Score:
 
     # 3. Replace part content with only the extreme notes
     part = flat_score.content[0]
-    part.content = sorted(onset_note.values(), key=lambda n: n.onset)
+    part.content = sorted(onset_note.values(), key=attrgetter("onset"))
     for note in part.content:
         note.parent = part
 
@@ -195,7 +195,7 @@ def test_dd2_long_and_short():
     print(dd2.data)
     # Check that the very short and very long durations are handled correctly
     correct = [[0.0] * 9 for _ in range(9)]
-    correct[3][7] = 1.0
+    correct[2][6] = 1.0  # eighth, then half
     print('"correct" values', correct)
     assert_equal_dist2d(dd2, correct)
 
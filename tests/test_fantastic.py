@@ -1,9 +1,14 @@
 import math
 
+import numpy as np
 import pytest
 
+from amads.algorithms.ngrams import NGramCounter
 from amads.core.basics import Score
+from amads.melody.contour.polynomial_contour import PolynomialContour
 from amads.melody.fantastic import (
+    fantastic_all_features,
+    fantastic_batch_features,
     fantastic_count_mtypes,
     fantastic_huron_contour_features,
     fantastic_interpolation_contour_features,
@@ -14,6 +19,7 @@ from amads.melody.fantastic import (
     fantastic_polynomial_contour_features,
     fantastic_step_contour_features,
 )
+from amads.melody.segment import fantastic_segmenter
 
 __author__ = "David Whyatt"
 
@@ -31,6 +37,48 @@ def test_fantastic_count_mtypes():
     for i in range(1, 6):
         assert any(len(ngram) == i for ngram in types.ngram_counts.keys())
 
+    # Two phrases of three notes, i.e. two M-Types each. M-Types are
+    # counted within phrases, so there are no n-grams longer than 2
+    phrases = Score.from_melody(
+        pitches=[60, 62, 64, 67, 65, 64],
+        durations=[1.0, 1.0, 1.0, 1.0, 1.0, 1.0],
+        iois=[1.0, 1.0, 3.0, 1.0, 1.0],
+    )
+    types = fantastic_count_mtypes(
+        phrases, segment=True, phrase_gap=2.0, units="quarters"
+    )
+    assert max(len(ngram) for ngram in types.ngram_counts) == 2
+    assert sum(types.get_counts(1).values()) == 4
+
+
+def test_fantastic_return_types():
+    melody = Score.from_melody(
+        pitches=[60, 62, 64, 67, 65, 64],
+        durations=[1.0, 1.0, 1.0, 1.0, 1.0, 1.0],
+        iois=[1.0, 1.0, 3.0, 1.0, 1.0],
+    )
+
+    # M-Types are returned in an NGramCounter, for the summary features
+    for segment in (False, True):
+        types = fantastic_count_mtypes(
+            melody, segment=segment, phrase_gap=2.0, units="quarters"
+        )
+        assert isinstance(types, NGramCounter)
+
+    # The segmenter returns each phrase as a Score starting at time 0
+    phrases = fantastic_segmenter(melody, phrase_gap=2.0, units="quarters")
+    assert all(isinstance(phrase, Score) for phrase in phrases)
+    assert [phrase.get_sorted_notes()[0].onset for phrase in phrases] == [
+        0.0,
+        0.0,
+    ]
+
+    # Info properties set by the readers are kept in the phrase notes
+    melody.get_sorted_notes()[3].set("rolled", True)
+    phrases = fantastic_segmenter(melody, phrase_gap=2.0, units="quarters")
+    assert phrases[1].get_sorted_notes()[0].get("rolled") is True
+    assert phrases[0].get_sorted_notes()[0].info is None
+
 
 def test_fantastic_interpolation_contour_features():
     # Test with a melody that generally increases in pitch
@@ -205,6 +253,37 @@ def test_fantastic_polynomial_contour_features():
     )
 
 
+def test_polynomial_contour_search_stops_safely(monkeypatch):
+    """The model search may stop early, but selects the same models as
+    the full search, also on long melodies"""
+    n = 20
+    onsets = np.arange(n, dtype=np.float64) - (n - 1) / 2
+    rng = np.random.default_rng(0)
+    pitches = np.column_stack(
+        [
+            rng.integers(55, 80, n),  # a long melody
+            np.full(n, 60),  # a repeated note
+            # fitted well with coefficients small enough to count as no
+            # parameters, because the powers of the onsets are large
+            1e-10 * onsets**10,
+        ]
+    ).astype(np.float64)
+
+    def select(melodies):
+        return PolynomialContour._select_models(onsets, melodies, n // 2)
+
+    early = [select(pitches[:, [i]]) for i in range(pitches.shape[1])]
+    monkeypatch.setattr(
+        PolynomialContour,
+        "_min_bic",
+        staticmethod(
+            lambda x_full, pitches: np.full(pitches.shape[1], -np.inf)
+        ),
+    )
+    for i, coefficients in enumerate(early):
+        assert np.array_equal(coefficients, select(pitches[:, [i]]))
+
+
 def test_fantastic_huron_contour_features():
     melody = Score.from_melody(
         pitches=[60, 62, 64, 65, 67, 72], durations=[1.0] * 6
@@ -392,3 +471,59 @@ def test_fantastic_pitch_interval_features():
     assert zigzag_features["std_absolute_interval"] == 0
     assert zigzag_features["modal_interval"] == 5
     assert zigzag_features["interval_entropy"] == 0  # Only one interval size
+
+    # Equally common intervals: the smallest one is the modal interval
+    tied = Score.from_melody(pitches=[60, 64, 66, 70, 72], durations=[1.0] * 5)
+    assert fantastic_pitch_interval_features(tied)["modal_interval"] == 2
+
+
+def test_fantastic_all_features():
+    melody = Score.from_melody(
+        pitches=[56, 58, 61, 58, 65, 65, 63],
+        durations=[0.25, 0.25, 0.25, 0.25, 0.75, 0.75, 0.5],
+    )
+
+    features = fantastic_all_features(melody)
+
+    # Each group matches its own feature function
+    assert features["pitch"] == fantastic_pitch_features(melody)
+    assert features["pitch_interval"] == fantastic_pitch_interval_features(
+        melody
+    )
+    assert features["step_contour"] == fantastic_step_contour_features(melody)
+    assert features[
+        "interpolation_contour"
+    ] == fantastic_interpolation_contour_features(melody)
+    assert features["parsons_contour"] == fantastic_parsons_contour_features(
+        melody
+    )
+    assert features[
+        "polynomial_contour"
+    ] == fantastic_polynomial_contour_features(melody)
+    assert features["huron_contour"] == fantastic_huron_contour_features(melody)
+    # (some M-Type statistics are NaN for so short a melody, so only
+    # compare the keys)
+    assert features["mtype_summary"].keys() == (
+        fantastic_mtype_summary_features(
+            melody, segment=False, phrase_gap=1.0, units="quarters"
+        ).keys()
+    )
+
+
+def test_fantastic_batch_features():
+    melodies = [
+        Score.from_melody(pitches=[60, 62, 64, 65, 67, 65, 64, 62]),
+        Score.from_melody(pitches=[67, 65, 64, 62, 60, 62, 64, 60]),
+        Score.from_melody(pitches=[56, 58, 61, 58, 65, 65, 63, 61]),
+    ]
+
+    for n_jobs in (1, 2):
+        features = fantastic_batch_features(melodies, n_jobs=n_jobs)
+        assert len(features) == len(melodies)
+        for melody, melody_features in zip(melodies, features):
+            expected = fantastic_all_features(melody)
+            assert melody_features["pitch"] == expected["pitch"]
+            assert (
+                melody_features["polynomial_contour"]
+                == expected["polynomial_contour"]
+            )
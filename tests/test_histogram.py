@@ -1,8 +1,8 @@
-"""Tests for Histogram1D behavior."""
+"""Tests for Histogram1D and Histogram2D behavior."""
 
 import pytest
 
-from amads.core.histogram import Histogram1D, boundaries_to_centers
+from amads.core.histogram import Histogram1D, Histogram2D, boundaries_to_centers
 
 
 def test_histogram_ignore_extrema_last_bin_and_discard_out_of_range():
@@ -76,3 +76,21 @@ def test_histogram_centers_only_log_interpolation():
         h.add_point(value)
 
     assert h.bins == [1.0, 2.0, 2.0]
+
+
+def test_histogram_2d_ignore_extrema_bins():
+    """Pairs should be counted in the same bins as Histogram1D uses."""
+    h = Histogram2D(bin_boundaries=[0, 10, 20, 30], ignore_extrema=True)
+
+    prev_bin = h.add_point_2d(None, 5)
+    assert prev_bin == 0
+    prev_bin = h.add_point_2d(5, 25, prev=prev_bin)  # first to last bin
+    assert prev_bin == 2
+    prev_bin = h.add_point_2d(25, 15, prev=prev_bin)  # last to middle bin
+    assert prev_bin == 1
+    assert h.bins == [[0.0, 0.0, 1.0], [0.0, 0.0, 0.0], [0.0, 1.0, 0.0]]
+
+    # pairs with a value out of range are discarded
+    assert h.add_point_2d(15, 30) is None
+    assert h.add_point_2d(-1, 15) is None
+    assert h.bins == [[0.0, 0.0, 1.0], [0.0, 0.0, 0.0], [0.0, 1.0, 0.0]]
@@ -0,0 +1,54 @@
+from amads.core.basics import Score
+from amads.core.histogram import Histogram2D
+from amads.pitch.ivdist2 import interval_distribution_2
+
+
+def test_interval_distribution_2_bins():
+    """
+    Regression test: interval i must be counted in row/column i + 12.
+    Previously, transitions were counted one bin too high, and an octave
+    (the last bin) raised IndexError.
+    """
+    score = Score.from_melody(pitches=[60, 62, 74, 74], durations=1.0)
+    dist = interval_distribution_2(
+        score, weighted=False, miditoolbox_compatible=False
+    )
+    assert dist.dimensions == [25, 25]
+    assert dist.data[14][24] == 0.5  # +2 then +12
+    assert dist.data[24][12] == 0.5  # +12 then 0
+    assert sum(v for row in dist.data for v in row) == 1.0
+
+
+def test_interval_distribution_2_miditoolbox_compatible():
+    score = Score.from_melody(pitches=[60, 62, 74], durations=1.0)
+    dist = interval_distribution_2(
+        score, weighted=False, miditoolbox_compatible=True
+    )
+    # an initial unison is inserted and the octave is folded to unison
+    assert dist.data[12][14] > 0.49  # 0 then +2
+    assert dist.data[14][12] > 0.49  # +2 then +12, folded to 0
+    assert sum(v for row in dist.data for v in row) > 0.99
+
+
+def test_interval_distribution_2_matches_histogram():
+    """The transitions match those counted by Histogram2D"""
+    pitches = [60, 62, 79, 77, 65, 65, 72, 60, 48, 50]  # leaps > an octave
+    score = Score.from_melody(pitches=pitches, durations=1.0)
+    dist = interval_distribution_2(
+        score, weighted=False, miditoolbox_compatible=False
+    )
+
+    h = Histogram2D(
+        [float(i - 12) for i in range(25)],
+        [i - 12 - 0.5 for i in range(26)],
+        "linear",
+        True,
+    )
+    prev_iv = None
+    prev_bin = None
+    for prev_pitch, pitch in zip(pitches, pitches[1:]):
+        iv = pitch - prev_pitch
+        prev_bin = h.add_point_2d(prev_iv, iv, 1.0, prev_bin)
+        prev_iv = None if prev_bin is None else iv
+    h.normalize()
+    assert dist.data == h.bins
@@ -127,6 +127,26 @@ def test_salience():
         assert np.allclose(corr, expected_corr, rtol=1e-15)
 
 
+def test_only_index():
+    """only_index selects one of the 12 correlations for each attribute"""
+    score = Score.from_melody([60, 62, 64, 65, 67, 69, 71, 72, 62, 67])
+    for profile, names in [
+        (prof.krumhansl_kessler, ["major", "minor"]),
+        (prof.quinn_white, ["major_asym", "minor_asym"]),
+    ]:
+        full = key_cc(score, profile, names + ["invalid_attribute"])
+        for index in (0, 7):
+            result = key_cc(
+                score, profile, names + ["invalid_attribute"], only_index=index
+            )
+            assert result[-1] == ("invalid_attribute", None)
+            for (attr, corr), (full_attr, full_corr) in zip(
+                result[:-1], full[:-1]
+            ):
+                assert attr == full_attr
+                assert corr == (full_corr[index],)
+
+
 def test_sarabande():
     from amads.pitch.pcdist1 import pitch_class_distribution_1
 
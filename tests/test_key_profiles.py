@@ -2,6 +2,7 @@
 
 from dataclasses import fields
 
+import numpy as np
 import pytest
 
 from amads.pitch.key.profiles import PitchProfile, source_list
@@ -56,3 +57,20 @@ def test_missing_attributes():
     for profile in source_list:
         with pytest.raises(AttributeError):
             _ = profile().__getitem__("missing")
+
+
+def test_canonical_matrix_cache():
+    """The cached canonical matrix is protected and follows normalize()"""
+    profile = PitchProfile("Test.major", tuple(float(i) for i in range(12)))
+    matrix = profile.as_canonical_matrix()
+    assert matrix.shape == (12, 12)
+    assert list(matrix[1]) == [11.0] + [float(i) for i in range(11)]
+    matrix[0, 0] = -1.0  # modifying the result does not affect the cache
+    assert profile.as_canonical_matrix()[0, 0] == 0.0
+    centered, inv_norms = profile._centered_canonical_matrix
+    assert centered[0].sum() == pytest.approx(0.0)
+    assert inv_norms[0] == pytest.approx(1 / np.linalg.norm(centered[0]))
+    profile.normalize()
+    assert profile.as_canonical_matrix()[0].sum() == pytest.approx(1.0)
+    centered_normalized, _ = profile._centered_canonical_matrix
+    assert centered_normalized[0] == pytest.approx(centered[0] / 66)
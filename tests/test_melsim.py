@@ -1,16 +1,25 @@
+import json
 import math
 import os
 from unittest.mock import Mock
 
+import numpy as np
 import pytest
 
 from amads.core.basics import Score
+from amads.melody.similarity import melsim
 from amads.melody.similarity.melsim import (
+    MelsimWorker,
     _convert_strings_to_tuples,
+    _matrix_to_dict,
+    _melody_key,
+    _save_similarities,
+    _SimilarityCache,
     check_python_package_installed,
     check_r_packages_installed,
     get_similarities,
     get_similarity,
+    get_similarity_matrix,
     install_dependencies,
     install_r_package,
     score_to_arrays,
@@ -53,6 +62,179 @@ def test_transformation_usage():
     assert similarity == 1.0
 
 
+def test_similarity_worker_is_reused():
+    """Test that repeated calculations share one R session."""
+    mel_1 = Score.from_melody(pitches=[60, 62, 64, 65], durations=1.0)
+    mel_2 = Score.from_melody(pitches=[60, 62, 64, 67], durations=1.0)
+
+    assert get_similarity(mel_1, mel_2, "Jaccard", "pitch") == 0.6
+    process = melsim._worker._process
+    assert get_similarity(mel_2, mel_1, "Jaccard", "pitch") == 0.6
+    assert melsim._worker._process is process
+    assert melsim._worker.running
+
+
+def test_melsim_worker_context_manager():
+    """Test that MelsimWorker starts R on entry and stops it on exit."""
+    with MelsimWorker() as worker:
+        assert worker.running
+        with pytest.raises(RuntimeError, match="Error in melsim"):
+            worker.call({"melodies": "not melodies"})
+        assert worker.running  # errors do not stop the worker
+    assert not worker.running
+
+
+def test_launch_worker_without_r(monkeypatch):
+    """Test that R failing to launch is only reported when R is needed."""
+    monkeypatch.setattr(melsim, "_worker", None)
+    monkeypatch.setattr(melsim, "_rscript_path", None)
+    monkeypatch.setattr(
+        melsim, "_find_rscript", Mock(side_effect=RuntimeError("no R"))
+    )
+    melsim._launch_worker()
+    with pytest.raises(RuntimeError, match="no R"):
+        melsim._get_worker().start()
+
+
+def test_get_similarity_is_memoized(monkeypatch):
+    """Test that repeated comparisons are not sent to R again."""
+    calls = []
+
+    def fake_batch(args_list, n_cores=1, cache=None):
+        calls.append(args_list)
+        return [0.5] * len(args_list)
+
+    monkeypatch.setattr(melsim, "_batch_compute_similarities", fake_batch)
+    melsim._cached_similarity.cache_clear()
+    mel_1 = Score.from_melody(pitches=[60, 62, 64, 65], durations=1.0)
+    mel_2 = Score.from_melody(pitches=[60, 62, 64, 67], durations=1.0)
+
+    assert get_similarity(mel_1, mel_2, "Jaccard", "pitch") == 0.5
+    assert get_similarity(mel_1, mel_2, "Jaccard", "pitch") == 0.5
+    assert len(calls) == 1
+    # Jaccard is symmetric, so the reverse comparison is cached too
+    assert get_similarity(mel_2, mel_1, "Jaccard", "pitch") == 0.5
+    assert len(calls) == 1
+    # melodies are looked up by content, not by Score
+    copy = Score.from_melody(pitches=[60, 62, 64, 65], durations=1.0)
+    assert get_similarity(copy, mel_2, "Jaccard", "pitch") == 0.5
+    assert len(calls) == 1
+    get_similarity(mel_1, mel_2, "Jaccard", "int")
+    get_similarity(mel_2, mel_1, "sim_NCD", "pitch")
+    get_similarity(mel_1, mel_2, "sim_NCD", "pitch")
+    assert len(calls) == 4
+    melsim._cached_similarity.cache_clear()
+
+
+def test_get_similarities_dataframe(monkeypatch):
+    """Test returning similarity matrices as pandas DataFrames."""
+    monkeypatch.setattr(
+        melsim,
+        "_batch_compute_similarities",
+        lambda args_list, n_cores=1, cache=None: [0.5] * len(args_list),
+    )
+    mel_1 = Score.from_melody(pitches=[60, 62, 64, 65], durations=1.0)
+    mel_2 = Score.from_melody(pitches=[60, 62, 64, 67], durations=1.0)
+    scores = {"melody1": mel_1, "melody2": mel_2}
+
+    matrix = get_similarities(scores, return_type="dataframe")
+    assert list(matrix.index) == ["melody1", "melody2"]
+    assert list(matrix.columns) == ["melody1", "melody2"]
+    assert matrix.loc["melody1", "melody2"] == 0.5
+    assert matrix.loc["melody2", "melody2"] == 1.0
+
+    matrices = get_similarities(
+        scores, method=["Jaccard", "Dice"], return_type="dataframe"
+    )
+    assert matrices[("Dice", "pitch")].equals(matrix)
+
+    with pytest.raises(ValueError, match="Invalid return_type"):
+        get_similarities(scores, return_type="list")
+
+
+def test_get_similarities_skips_identical_melodies(monkeypatch):
+    """Test that melodies with the same content are not compared."""
+    compared = []
+
+    def fake_batch(args_list, n_cores=1, cache=None):
+        compared.extend(args_list)
+        return [0.5] * len(args_list)
+
+    monkeypatch.setattr(melsim, "_batch_compute_similarities", fake_batch)
+    mel_1 = Score.from_melody(pitches=[60, 62, 64, 65], durations=1.0)
+    mel_2 = Score.from_melody(pitches=[60, 62, 64, 67], durations=1.0)
+    copy = Score.from_melody(pitches=[60, 62, 64, 65], durations=1.0)
+    scores = {"melody1": mel_1, "melody2": mel_2, "copy": copy}
+
+    matrix = get_similarities(scores)
+    assert len(compared) == 2
+    assert matrix["melody1"]["copy"] == matrix["copy"]["melody1"] == 1.0
+    assert matrix["melody2"]["copy"] == matrix["melody1"]["melody2"] == 0.5
+
+    # methods not known to give 1 for equal melodies are left to R
+    compared.clear()
+    matrix = get_similarities(scores, method="sim_NCD")
+    assert len(compared) == 3
+    assert matrix["melody1"]["copy"] == 0.5
+
+
+def test_get_similarities_skips_equal_transformations(monkeypatch):
+    """Test that melodies equal after a transformation are not compared."""
+    compared = []
+
+    def fake_batch(args_list, n_cores=1, cache=None):
+        compared.extend(args[3] for args in args_list)
+        return [0.5] * len(args_list)
+
+    monkeypatch.setattr(melsim, "_batch_compute_similarities", fake_batch)
+    mel_1 = Score.from_melody(pitches=[60, 62, 64, 65], durations=1.0)
+    # a transposition, with a different rhythm
+    mel_2 = Score.from_melody(pitches=[62, 64, 66, 67], durations=0.5)
+    scores = {"melody1": mel_1, "melody2": mel_2}
+
+    transformations = ["pitch", "int", "parsons", "ioi_class"]
+    results = get_similarities(scores, transformation=transformations)
+    assert sorted(compared) == ["ioi_class", "pitch"]
+    for t, expected in zip(transformations, [0.5, 1.0, 1.0, 0.5]):
+        assert results[("Jaccard", t)]["melody1"]["melody2"] == expected
+
+    # methods not known to give 1 for equal melodies are left to R
+    compared.clear()
+    results = get_similarities(
+        scores, method="correlation", transformation=transformations
+    )
+    assert sorted(compared) == sorted(transformations)
+    assert results[("correlation", "int")]["melody1"]["melody2"] == 0.5
+
+
+def test_get_similarity_matrix(monkeypatch):
+    """Test that each distinct comparison is made once, in one batch."""
+    batches = []
+
+    def fake_batch(args_list, n_cores=1, cache=None):
+        batches.append(args_list)
+        return [0.5] * len(args_list)
+
+    monkeypatch.setattr(melsim, "_batch_compute_similarities", fake_batch)
+    mel_1 = Score.from_melody(pitches=[60, 62, 64, 65], durations=1.0)
+    mel_2 = Score.from_melody(pitches=[60, 62, 64, 67], durations=1.0)
+    mel_3 = Score.from_melody(pitches=[67, 65, 64, 62], durations=1.0)
+
+    matrix = get_similarity_matrix([mel_1, mel_2], [mel_2, mel_3, mel_1])
+    assert matrix.shape == (2, 3)
+    assert matrix.tolist() == [[0.5, 0.5, 1.0], [1.0, 0.5, 0.5]]
+    # (mel_1, mel_2) and (mel_2, mel_1) are one comparison
+    assert len(batches) == 1
+    assert len(batches[0]) == 3
+
+    matrix = get_similarity_matrix([mel_1, mel_2, mel_3])
+    assert np.array_equal(matrix, matrix.T)
+    assert np.array_equal(np.diag(matrix), np.ones(3))
+
+    matrix = get_similarity_matrix([mel_1], [mel_1, mel_2], "sim_NCD")
+    assert matrix.tolist() == [[0.5, 0.5]]
+
+
 def test_validate_method():
     """Test method validation."""
     # Valid methods should not raise errors
@@ -104,10 +286,83 @@ def test_score_to_arrays():
     assert len(pitches) == 4
     assert len(starts) == 4
     assert len(ends) == 4
-    assert pitches == [60, 62, 64, 65]
-    assert all(isinstance(p, int) for p in pitches)
-    assert all(isinstance(s, float) for s in starts)
-    assert all(isinstance(e, float) for e in ends)
+    assert pitches.tolist() == [60, 62, 64, 65]
+    assert starts.tolist() == [0.0, 1.0, 2.0, 3.0]
+    assert ends.tolist() == [1.0, 2.0, 3.0, 4.0]
+    for array in (pitches, starts, ends):
+        assert isinstance(array, np.ndarray)
+        assert array.dtype == np.float64
+
+
+def test_melody_key():
+    """Test that melody keys depend only on the melody content."""
+    mel = Score.from_melody(pitches=[60, 62, 64, 65], durations=1.0)
+    pitches, starts, ends = score_to_arrays(mel)
+    key = _melody_key(pitches, starts, ends)
+
+    assert _melody_key(np.array(pitches), starts, np.array(ends)) == key
+    transposed = [p + 2 for p in pitches]
+    assert _melody_key(transposed, starts, ends) != key
+    assert _melody_key(pitches, ends, starts) != key
+
+
+def test_similarity_cache(tmp_path):
+    """Test saving and loading similarities in the cache."""
+    path = tmp_path / "similarities.db"
+    jaccard = _SimilarityCache.key("a", "b", "Jaccard", "pitch")
+    const = _SimilarityCache.key("a", "b", "const", "pitch")
+    with _SimilarityCache(path) as cache:
+        assert cache.get(jaccard) is None
+        cache.update([(jaccard, 0.6), (const, float("nan"))])
+
+    with _SimilarityCache(path) as cache:
+        assert cache.get(jaccard) == 0.6
+        assert math.isnan(cache.get(const))
+        # symmetric methods are saved for both orders of the melodies
+        assert cache.get(cache.key("b", "a", "Jaccard", "pitch")) == 0.6
+        assert cache.get(cache.key("b", "a", "sim_NCD", "pitch")) is None
+        assert cache.get(cache.key("a", "b", "Jaccard", "int")) is None
+
+
+def test_get_similarities_from_cache(tmp_path):
+    """Test that get_similarities uses similarities from the cache file."""
+    mel_1 = Score.from_melody(pitches=[60, 62, 64, 65], durations=1.0)
+    mel_2 = Score.from_melody(pitches=[60, 62, 64, 67], durations=1.0)
+    key_1 = _melody_key(*score_to_arrays(mel_1))
+    key_2 = _melody_key(*score_to_arrays(mel_2))
+    path = tmp_path / "similarities.db"
+    with _SimilarityCache(path) as cache:
+        cache.update([(cache.key(key_1, key_2, "Jaccard", "pitch"), 0.25)])
+
+    # everything is in the cache, so nothing is computed by R
+    results = get_similarities(
+        {"melody1": mel_1, "melody2": mel_2}, cache_file=path
+    )
+    assert results["melody1"]["melody2"] == 0.25
+    assert results["melody2"]["melody1"] == 0.25
+
+
+def test_save_similarities(tmp_path):
+    """Test saving similarity matrices as JSON and as .npz."""
+    names = ["melody1", "melody2"]
+    combos = [("Jaccard", "pitch"), ("const", "int")]
+    sim_arrays = np.array([[[1.0, 0.6], [0.6, 1.0]], [[1.0, np.nan]] * 2])
+
+    path = _save_similarities(tmp_path / "results", combos, sim_arrays, names)
+    assert path == tmp_path / "results.json"
+    expected = {
+        f"{m}_{t}": _matrix_to_dict(sim_array, names)
+        for (m, t), sim_array in zip(combos, sim_arrays)
+    }
+    assert path.read_text() == json.dumps(expected, indent=2)
+
+    path = _save_similarities(
+        tmp_path / "results.npz", combos, sim_arrays, names
+    )
+    with np.load(path) as saved:
+        assert saved["names"].tolist() == names
+        np.testing.assert_array_equal(saved["Jaccard_pitch"], sim_arrays[0])
+        np.testing.assert_array_equal(saved["const_int"], sim_arrays[1])
 
 
 def test_convert_strings_to_tuples():
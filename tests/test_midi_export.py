@@ -17,12 +17,19 @@ MM         x      x     x
 
 import math
 import tempfile
+import threading
+import warnings
 
 import pytest
 
 from amads.algorithms.scores_compare import scores_compare
+from amads.io import readscore, writescore
 from amads.io.readscore import read_score, set_preferred_midi_reader
-from amads.io.writescore import set_preferred_midi_writer, write_score
+from amads.io.writescore import (
+    set_preferred_midi_writer,
+    write_score,
+    write_score_async,
+)
 from amads.music import example
 from amads.pitch.pitch_mean import pitch_mean
 
@@ -114,3 +121,52 @@ def test_midi_export_and_reimport(midi_file):
             )
             comparison_result = scores_compare(ref_score, test_score, True)
             assert comparison_result
+
+
+def test_write_score_async(tmp_path):
+    """Test that write_score_async writes files in the background."""
+    set_preferred_midi_reader("mido")
+    set_preferred_midi_writer("mido")
+    ref_score = read_score(example.fullpath("midi/sarabande.mid"))
+    paths = [tmp_path / f"async{i}.mid" for i in range(3)]
+    futures = [write_score_async(ref_score, path) for path in paths]
+    for path, future in zip(paths, futures):
+        assert future.result() == path
+        assert scores_compare(ref_score, read_score(path), True)
+
+
+def test_read_score_while_writing(tmp_path, monkeypatch, capsys):
+    """Test that read_score completes while an asynchronous write is pending,
+    and that each call counts only its own warnings."""
+    set_preferred_midi_reader("mido")
+    set_preferred_midi_writer("mido")
+    ref_score = read_score(example.fullpath("midi/sarabande.mid"))
+
+    started = threading.Event()
+    release = threading.Event()
+    export_score = writescore._export_score
+
+    def slow_export(*args):
+        warnings.warn("writer warning")
+        started.set()
+        assert release.wait(10)
+        export_score(*args)
+
+    monkeypatch.setattr(writescore, "_export_score", slow_export)
+    monkeypatch.setattr(writescore, "writer_warning_level", "low")
+    monkeypatch.setattr(readscore, "reader_warning_level", "low")
+    path = tmp_path / "async.mid"
+    future = write_score_async(ref_score, path)
+    try:
+        assert started.wait(10)
+        capsys.readouterr()
+        score = read_score(example.fullpath("midi/sarabande.mid"))
+        assert not future.done()
+        assert "read_score" not in capsys.readouterr().out
+    finally:
+        release.set()
+    assert future.result() == path
+    assert "1 warnings were generated in write_score" in (
+        capsys.readouterr().out
+    )
+    assert scores_compare(ref_score, score, True)
@@ -5,7 +5,7 @@ import pytest
 from amads.algorithms.mtype_tokenizer import FantasticTokenizer, MType
 from amads.algorithms.ngrams import NGramCounter
 from amads.core.basics import Score
-from amads.melody.segment import fantastic_segmenter
+from amads.melody.segment import fantastic_segmenter, fantastic_segmenter_notes
 
 
 def test_mtype_tokenizer():
@@ -110,6 +110,64 @@ def test_mtype_tokenizer():
         ngrams.count_ngrams(segment_tokens, n=max_length + 1)
 
 
+def test_mtype_ioi_ratio_classes():
+    melody = Score.from_melody(
+        pitches=[60, 62, 64, 65], durations=[1.0, 0.5, 1.0, 1.0]
+    )
+    tokens = FantasticTokenizer().tokenize(melody)
+
+    assert [token.pitch_interval_class for token in tokens] == [
+        "u2",
+        "u2",
+        "u2",
+    ]
+    # IOIs are 1.0, 0.5, 1.0: the first M-Type has no IOI ratio, then the
+    # ratios are 0.5 (quicker) and 2.0 (longer)
+    assert [token.ioi_ratio_class for token in tokens] == [None, "q", "l"]
+
+
+def test_tokenize_notes():
+    melody = Score.from_melody(
+        pitches=[60, 62, 64, 60, 67, 65, 64],
+        durations=[1.0, 1.0, 2.0, 1.0, 1.0, 1.0, 2.0],
+        iois=[1.0, 1.0, 3.0, 1.0, 1.0, 1.0],
+    )
+    tokenizer = FantasticTokenizer()
+
+    # Tokenizing the phrases as notes gives the same M-Types as tokenizing
+    # them as Scores
+    phrase_notes = fantastic_segmenter_notes(
+        melody, phrase_gap=2.0, units="quarters"
+    )
+    phrase_scores = fantastic_segmenter(
+        melody, phrase_gap=2.0, units="quarters"
+    )
+    assert len(phrase_notes) == len(phrase_scores) == 2
+    for notes, phrase in zip(phrase_notes, phrase_scores):
+        assert tokenizer.tokenize_notes(notes) == tokenizer.tokenize(phrase)
+
+
+def test_segmenting_and_tokenizing_leave_notes_unchanged():
+    melody = Score.from_melody(
+        pitches=[60, 62, 64, 60, 67, 65, 64],
+        durations=[1.0, 1.0, 2.0, 1.0, 1.0, 1.0, 2.0],
+        iois=[1.0, 1.0, 3.0, 1.0, 1.0, 1.0],
+    )
+    tokenizer = FantasticTokenizer()
+
+    tokenizer.tokenize(melody)
+    for phrase in fantastic_segmenter_notes(
+        melody, phrase_gap=2.0, units="quarters"
+    ):
+        tokenizer.tokenize_notes(phrase)
+    fantastic_segmenter(melody, phrase_gap=2.0, units="quarters")
+
+    # No IOIs, intervals or other properties were stored in the notes
+    for note in melody.get_sorted_notes():
+        assert note.info is None
+        assert note.parent.score is melody
+
+
 def test_mtype_encodings():
     possible_interval_classes = FantasticTokenizer.interval_classes
 
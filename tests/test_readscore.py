@@ -6,8 +6,13 @@ Important business first: score from URL ;)
 See more extensive tests on musicXML in test_midi_roundtrip and test_xml_export
 """
 
+import types
+import warnings
+from pathlib import Path
+
 from amads.algorithms.scores_compare import notes_compare, scores_compare
 from amads.core.basics import Measure, Note, Staff
+from amads.io import readscore
 from amads.io.readscore import (
     last_used_reader,
     read_score,
@@ -228,3 +233,53 @@ def test_grace_trills_example():
     assert notes[15].get("has_turn", False)
     assert notes[15].get("turn_pitches")[0].name_with_octave == "C4"
     assert notes[15].get("turn_pitches")[1].name_with_octave == "Ab3"
+
+
+def test_read_unknown_extension(tmp_path):
+    """Files without a recognized extension are identified by content."""
+    set_reader_warning_level("none")
+    for name in ["midi/sarabande.mid", "musicxml/bwv846m15-16.musicxml"]:
+        src = example.fullpath(name)
+        assert src is not None
+        reference = read_score(src)
+        dat_file = tmp_path / "score.dat"
+        dat_file.write_bytes(Path(src).read_bytes())
+        score = read_score(dat_file)
+        assert len(score.list_all(Note)) == len(reference.list_all(Note))
+
+
+def test_reader_warnings_each_read(monkeypatch, capsys):
+    """Every read reports its warnings, and the filters are restored."""
+
+    def import_score(*args):
+        warnings.warn("reader warning")
+        warnings.warn("deprecated", DeprecationWarning)
+        return "score"
+
+    # issue the warnings as if from amads.io.readscore, the way a reader's
+    # warnings come from its own module
+    import_score = types.FunctionType(import_score.__code__, vars(readscore))
+    monkeypatch.setattr(readscore, "_import_score", import_score)
+    filters = list(warnings.filters)
+    showwarning = warnings.showwarning
+    src = example.fullpath("midi/sarabande.mid")
+    try:
+        # "default" obeys the filters, which ignore the DeprecationWarning
+        set_reader_warning_level("default")
+        with warnings.catch_warnings():
+            warnings.simplefilter("default")
+            warnings.filterwarnings("ignore", category=DeprecationWarning)
+            for _ in range(2):
+                read_score(src)
+                out = capsys.readouterr().out
+                assert "UserWarning: reader warning" in out
+                assert "deprecated" not in out
+        # "low" counts all warnings
+        set_reader_warning_level("low")
+        for _ in range(2):
+            read_score(src)
+            assert "2 warnings were generated" in capsys.readouterr().out
+    finally:
+        set_reader_warning_level("none")
+    assert warnings.filters == filters
+    assert warnings.showwarning is showwarning